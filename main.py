@@ -6,9 +6,11 @@ Executa pipeline completa de geracao de dataset TTS/STT a partir do YouTube
 Baseado em configuracao centralizada - Filosofia KISS
 """
 
+import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
@@ -20,129 +22,259 @@ if src_path not in sys.path:
 # Importacoes dos modulos da pipeline
 from config import default_config, validate_and_show_config
 
+# Logger da pipeline - handler sincrono para manter a ordem com a saida dos modulos
+log = logging.getLogger("katube")
+
+
+def setup_logging():
+    """Configura logger da pipeline escrevendo mensagens simples em stdout"""
+    if log.handlers:
+        return
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
 
 def print_header():
     """Imprime cabecalho da pipeline"""
-    print("=" * 70)
-    print("KATUBE PIPELINE - GERACAO AUTOMATICA DE DATASET TTS/STT")
-    print("Sistema Modular Integrado com Configuracao Centralizada")
-    print("=" * 70)
-    print(f"Inicio da execucao: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
+    log.info("=" * 70)
+    log.info("KATUBE PIPELINE - GERACAO AUTOMATICA DE DATASET TTS/STT")
+    log.info("Sistema Modular Integrado com Configuracao Centralizada")
+    log.info("=" * 70)
+    log.info(f"Inicio da execucao: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    log.info("")
 
 
 def print_step_header(step_number: int, step_name: str, enabled: bool):
     """Imprime cabecalho de cada etapa"""
     status = "EXECUTANDO" if enabled else "PULANDO"
-    print(f"\n[ETAPA {step_number}/6] {step_name.upper()} - {status}")
-    print("-" * 50)
+    log.info(f"\n[ETAPA {step_number}/6] {step_name.upper()} - {status}")
+    log.info("-" * 50)
 
 
-def execute_download_step() -> dict:
+def start_background_segmentation():
+    """
+    Inicia segmentacao em paralelo aos downloads (sobreposicao de etapas)
+    Cada audio e segmentado assim que baixado, aproveitando os delays anti-bloqueio
+    
+    Returns:
+        BackgroundSegmenter ou None se nao for possivel iniciar
+    """
+    try:
+        from processing.audio_segmenter import BackgroundSegmenter
+        
+        log.info("Segmentacao sera executada em paralelo aos downloads")
+        return BackgroundSegmenter(overwrite=default_config.DOWNLOAD['overwrite_existing']).start()
+        
+    except Exception as e:
+        log.warning(f"Aviso: segmentacao em paralelo indisponivel, executando apos download: {e}")
+        return None
+
+
+def execute_download_step(background_segmenter=None) -> dict:
     """Executa etapa de download de videos do YouTube"""
     try:
         from download.download_manager import DownloadManager
         
-        print("Inicializando gerenciador de download...")
-        manager = DownloadManager()
+        # Encaminha cada audio baixado direto para a segmentacao em paralelo
+        on_video_downloaded = None
+        if background_segmenter is not None:
+            on_video_downloaded = lambda video_id, audio_path: background_segmenter.submit(audio_path)
+        
+        log.info("Inicializando gerenciador de download...")
+        manager = DownloadManager(on_video_downloaded=on_video_downloaded)
         
-        print(f"URL configurada: {default_config.DOWNLOAD['target_url']}")
-        print(f"Limite de videos: {default_config.DOWNLOAD['limit'] or 'Todos'}")
+        cfg = default_config.DOWNLOAD
+        log.info(f"URL configurada: {cfg['target_url']}")
+        log.info(f"Limite de videos: {cfg['limit'] or 'Todos'}")
         
         result = manager.execute_download_pipeline()
         
         if result['status'] == 'success':
-            print(f"Download concluido com sucesso!")
-            print(f"Videos baixados: {result['stats']['videos_successful']}")
-            print(f"Arquivos de audio: {result['stats']['audio_files_created']}")
+            log.info(f"Download concluido com sucesso!")
+            log.info(f"Videos baixados: {result['stats']['videos_successful']}")
+            log.info(f"Arquivos de audio: {result['stats']['audio_files_created']}")
             return {"success": True, "stats": result['stats']}
         else:
-            print(f"Erro no download: {result['message']}")
+            log.error(f"Erro no download: {result['message']}")
             return {"success": False, "error": result['message']}
             
     except Exception as e:
-        print(f"Erro inesperado no download: {e}")
+        log.error(f"Erro inesperado no download: {e}")
         return {"success": False, "error": str(e)}
 
 
-def execute_segmentation_step() -> dict:
+def list_video_directories(downloads_path: str = "downloads") -> list:
+    """
+    Lista os diretorios de video (downloads/tipo_id/video_id/) uma unica vez
+    Reutilizada pelas etapas seguintes para evitar varreduras repetidas da arvore
+    
+    Returns:
+        Lista de caminhos dos diretorios de video
+    """
+    video_dirs = []
+    try:
+        with os.scandir(downloads_path) as groups:
+            for group in groups:
+                if group.is_dir():
+                    with os.scandir(group.path) as videos:
+                        video_dirs.extend(video.path for video in videos if video.is_dir())
+    except FileNotFoundError:
+        pass
+    
+    return sorted(video_dirs)
+
+
+def execute_segmentation_step(background_segmenter=None, video_dirs=None) -> dict:
     """Executa etapa de segmentacao de audio usando VAD"""
     try:
         from processing.audio_segmenter import segment_from_downloads_folder
         
-        print("Iniciando segmentacao de audio com Silero VAD...")
-        print(f"Configuracao: {default_config.SEGMENTATION['min_duration_sec']}-{default_config.SEGMENTATION['max_duration_sec']}s")
+        # Finaliza segmentacao feita em paralelo ao download
+        pipelined_results = []
+        already_segmented = None
+        if background_segmenter is not None:
+            log.info("Aguardando segmentacao executada em paralelo aos downloads...")
+            pipelined_results = background_segmenter.close()
+            already_segmented = background_segmenter.succeeded_files
+            log.info(f"Audios segmentados durante o download: {len(already_segmented)}")
+            if background_segmenter.failed_files:
+                log.warning(f"Falhas durante o download: {len(background_segmenter.failed_files)} (serao tentadas novamente)")
+        
+        log.info("Iniciando segmentacao de audio com Silero VAD...")
+        cfg = default_config.SEGMENTATION
+        log.info(f"Configuracao: {cfg['min_duration_sec']}-{cfg['max_duration_sec']}s")
         
         result = segment_from_downloads_folder(
             downloads_path="downloads",
-            overwrite=default_config.DOWNLOAD['overwrite_existing']
+            overwrite=default_config.DOWNLOAD['overwrite_existing'],
+            exclude=already_segmented,
+            video_dirs=video_dirs
         )
         
         if result.get('batch_completed'):
-            print(f"Segmentacao concluida!")
-            print(f"Diretorios processados: {result['successful']}")
-            print(f"Total de segmentos criados: {result['total_segments_created']}")
-            return {"success": True, "segments_created": result['total_segments_created']}
+            # Soma resultados da segmentacao em paralelo ao download
+            pipelined_ok = [r for r in pipelined_results if r['success'] and not r.get('skipped')]
+            successful = result['successful'] + len(pipelined_ok)
+            segments_created = result['total_segments_created'] + sum(r['final_segments_count'] for r in pipelined_ok)
+            
+            log.info(f"Segmentacao concluida!")
+            log.info(f"Diretorios processados: {successful}")
+            log.info(f"Falhas: {result['failed']}")
+            log.info(f"Total de segmentos criados: {segments_created}")
+            return {"success": True, "segments_created": segments_created}
         else:
-            print(f"Erro na segmentacao: {result.get('error', 'Erro desconhecido')}")
+            log.error(f"Erro na segmentacao: {result.get('error', 'Erro desconhecido')}")
             return {"success": False, "error": result.get('error')}
             
     except Exception as e:
-        print(f"Erro inesperado na segmentacao: {e}")
+        log.error(f"Erro inesperado na segmentacao: {e}")
         return {"success": False, "error": str(e)}
 
 
-def execute_transcription_step() -> dict:
-    """Executa transcricao com ambos os modelos (freds0 e lgris)"""
-    transcription_results = {"freds0": None, "lgris": None}
-    
-    # Transcricao freds0 (Whisper)
+def _cuda_device_count() -> int:
+    """Quantidade de GPUs CUDA disponiveis (0 se torch/CUDA indisponivel)"""
     try:
-        from transcription.freds0_transcriber import batch_transcribe_all_freds0
+        import torch
+        return torch.cuda.device_count()
+    except Exception:
+        return 0
+
+
+def _run_transcriber(label: str, model_name: str, batch_transcribe, overwrite: bool,
+                     video_dirs=None, device_index=None) -> dict:
+    """
+    Executa transcricao em lote de um modelo e resume o resultado
+    
+    Args:
+        label: Nome do modelo para exibicao (ex: "Freds0")
+        model_name: Nome do modelo configurado
+        batch_transcribe: Funcao de transcricao em lote do modelo
+        overwrite: Se deve sobrescrever transcricoes existentes
+        video_dirs: Diretorios de video ja listados
+        device_index: GPU dedicada ao modelo (None = dispositivo padrao)
         
-        print("\nExecutando transcricao freds0 (Whisper)...")
-        print(f"Modelo: {default_config.TRANSCRIPTION_FREDS0['model_name']}")
+    Returns:
+        Dict com success e stats/error
+    """
+    try:
+        log.info(f"\nExecutando transcricao {label.lower()} - modelo: {model_name}")
         
-        result = batch_transcribe_all_freds0(
-            downloads_path="downloads",
-            overwrite=default_config.TRANSCRIPTION_FREDS0['overwrite_existing']
-        )
+        result = batch_transcribe(downloads_path="downloads", overwrite=overwrite,
+                                  video_dirs=video_dirs, device_index=device_index)
         
         if result['status'] == 'completed':
             summary = result['batch_summary']
-            print(f"Freds0 concluido: {summary['successful_directories']} diretorios, {summary['total_segments_processed']} segmentos")
-            transcription_results["freds0"] = {"success": True, "stats": summary}
+            log.info(f"{label} concluido: {summary['successful_directories']} diretorios, {summary['total_segments_processed']} segmentos")
+            return {"success": True, "stats": summary}
         else:
-            print(f"Erro freds0: {result.get('error')}")
-            transcription_results["freds0"] = {"success": False, "error": result.get('error')}
+            log.error(f"Erro {label.lower()}: {result.get('error')}")
+            return {"success": False, "error": result.get('error')}
             
     except Exception as e:
-        print(f"Erro inesperado freds0: {e}")
-        transcription_results["freds0"] = {"success": False, "error": str(e)}
+        log.error(f"Erro inesperado {label.lower()}: {e}")
+        return {"success": False, "error": str(e)}
+
+
+def execute_transcription_step(video_dirs=None) -> dict:
+    """
+    Executa transcricao com ambos os modelos (freds0 e lgris)
+    Em paralelo apenas com 2+ GPUs (um modelo fixado em cada); com uma GPU
+    ou CPU executa em sequencia para os modelos nao disputarem o dispositivo
+    """
+    transcription_results = {"freds0": None, "lgris": None}
+    freds0_cfg = default_config.TRANSCRIPTION_FREDS0
+    lgris_cfg = default_config.TRANSCRIPTION_LGRIS
     
-    # Transcricao lgris (Wav2Vec2)
-    try:
-        from transcription.lgris_transcriber import batch_transcribe_all_lgris
-        
-        print("\nExecutando transcricao lgris (Wav2Vec2)...")
-        print(f"Modelo: {default_config.TRANSCRIPTION_LGRIS['model_name']}")
+    parallel = _cuda_device_count() >= 2
+    freds0_device, lgris_device = (0, 1) if parallel else (None, None)
+    
+    if parallel:
+        log.info("Transcricao em paralelo: freds0 na GPU 0, lgris na GPU 1")
+    
+    # Uma thread por modelo so quando cada um tem sua GPU; a inferencia torch libera o GIL
+    with ThreadPoolExecutor(max_workers=2 if parallel else 1) as executor:
+        futures = {}
         
-        result = batch_transcribe_all_lgris(
-            downloads_path="downloads",
-            overwrite=default_config.TRANSCRIPTION_LGRIS['overwrite_existing']
-        )
+        # Transcricao freds0 (Whisper)
+        try:
+            from transcription.freds0_transcriber import batch_transcribe_all_freds0
+            
+            futures[executor.submit(
+                _run_transcriber, "Freds0",
+                freds0_cfg['model_name'],
+                batch_transcribe_all_freds0,
+                freds0_cfg['overwrite_existing'],
+                video_dirs,
+                freds0_device
+            )] = "freds0"
+            
+        except Exception as e:
+            log.error(f"Erro inesperado freds0: {e}")
+            transcription_results["freds0"] = {"success": False, "error": str(e)}
         
-        if result['status'] == 'completed':
-            summary = result['batch_summary']
-            print(f"Lgris concluido: {summary['successful_directories']} diretorios, {summary['total_segments_processed']} segmentos")
-            transcription_results["lgris"] = {"success": True, "stats": summary}
-        else:
-            print(f"Erro lgris: {result.get('error')}")
-            transcription_results["lgris"] = {"success": False, "error": result.get('error')}
+        # Transcricao lgris (Wav2Vec2)
+        try:
+            from transcription.lgris_transcriber import batch_transcribe_all_lgris
             
-    except Exception as e:
-        print(f"Erro inesperado lgris: {e}")
-        transcription_results["lgris"] = {"success": False, "error": str(e)}
+            futures[executor.submit(
+                _run_transcriber, "Lgris",
+                lgris_cfg['model_name'],
+                batch_transcribe_all_lgris,
+                lgris_cfg['overwrite_existing'],
+                video_dirs,
+                lgris_device
+            )] = "lgris"
+            
+        except Exception as e:
+            log.error(f"Erro inesperado lgris: {e}")
+            transcription_results["lgris"] = {"success": False, "error": str(e)}
+        
+        for future in as_completed(futures):
+            transcription_results[futures[future]] = future.result()
     
     # Avaliacao do resultado conjunto
     freds0_ok = transcription_results["freds0"] and transcription_results["freds0"]["success"]
@@ -151,57 +283,57 @@ def execute_transcription_step() -> dict:
     if freds0_ok and lgris_ok:
         return {"success": True, "results": transcription_results}
     elif freds0_ok or lgris_ok:
-        print("Aviso: Apenas um modelo de transcricao funcionou, mas continuando...")
+        log.warning("Aviso: Apenas um modelo de transcricao funcionou, mas continuando...")
         return {"success": True, "results": transcription_results, "partial": True}
     else:
-        print("Erro: Ambos os modelos de transcricao falharam")
+        log.error("Erro: Ambos os modelos de transcricao falharam")
         return {"success": False, "results": transcription_results}
 
 
-def execute_normalization_step() -> dict:
+def execute_normalization_step(video_dirs=None) -> dict:
     """Executa normalizacao de transcricoes (se habilitada)"""
     try:
         from processing.transcription_normalizer import batch_process_all
         
-        print("Executando normalizacao de transcricoes...")
-        print("Preparando textos para validacao cruzada...")
+        log.info("Executando normalizacao de transcricoes...")
+        log.info("Preparando textos para validacao cruzada...")
         
         # Chama funcao de normalizacao em lote
-        batch_process_all("downloads")
+        batch_process_all("downloads", video_dirs)
         
-        print("Normalizacao concluida!")
+        log.info("Normalizacao concluida!")
         return {"success": True}
         
     except Exception as e:
-        print(f"Erro na normalizacao: {e}")
+        log.error(f"Erro na normalizacao: {e}")
         return {"success": False, "error": str(e)}
 
 
-def execute_validation_step() -> dict:
+def execute_validation_step(video_dirs=None) -> dict:
     """Executa validacao cruzada com threshold configurado"""
     try:
         from processing.transcription_validator import batch_validate_all
         
-        print("Executando validacao cruzada...")
-        print(f"Threshold configurado: {default_config.VALIDATION['similarity_threshold']:.1%}")
+        log.info("Executando validacao cruzada...")
+        log.info(f"Threshold configurado: {default_config.VALIDATION['similarity_threshold']:.1%}")
         
         # Executa validacao que ja salva em output/
-        batch_validate_all("downloads")
+        batch_validate_all("downloads", video_dirs)
         
         # Verifica se dataset final foi criado
         final_dataset = Path("output/final_dataset.csv")
         if final_dataset.exists():
-            with open(final_dataset, 'r') as f:
-                lines = f.readlines()
-            approved_count = len(lines) - 1  # Remove header
-            print(f"Dataset final criado: {approved_count} pares aprovados")
+            # Conta linhas iterando o arquivo (sem carregar tudo em memoria)
+            with open(final_dataset, 'r', encoding='utf-8') as f:
+                approved_count = sum(1 for _ in f) - 1  # Remove header
+            log.info(f"Dataset final criado: {approved_count} pares aprovados")
             return {"success": True, "approved_pairs": approved_count}
         else:
-            print("Aviso: Dataset final nao foi criado")
+            log.error("Aviso: Dataset final nao foi criado")
             return {"success": False, "error": "Dataset final nao gerado"}
             
     except Exception as e:
-        print(f"Erro na validacao: {e}")
+        log.error(f"Erro na validacao: {e}")
         return {"success": False, "error": str(e)}
 
 
@@ -210,31 +342,31 @@ def execute_cleanup_step() -> dict:
     try:
         from processing.cleanup_manager import run_cleanup_process
         
-        print("Executando limpeza de arquivos intermediarios...")
-        print("ATENCAO: Esta operacao remove permanentemente arquivos!")
+        log.info("Executando limpeza de arquivos intermediarios...")
+        log.info("ATENCAO: Esta operacao remove permanentemente arquivos!")
         
         success = run_cleanup_process()
         
         if success:
-            print("Limpeza concluida com sucesso!")
+            log.info("Limpeza concluida com sucesso!")
             return {"success": True}
         else:
-            print("Limpeza nao foi executada devido a erros")
+            log.error("Limpeza nao foi executada devido a erros")
             return {"success": False, "error": "Falha na execucao da limpeza"}
             
     except Exception as e:
-        print(f"Erro na limpeza: {e}")
+        log.error(f"Erro na limpeza: {e}")
         return {"success": False, "error": str(e)}
 
 
 def print_final_summary(pipeline_results: dict, total_time: float):
     """Imprime resumo final da execucao completa"""
-    print("\n" + "=" * 70)
-    print("RELATORIO FINAL DA PIPELINE KATUBE")
-    print("=" * 70)
-    print(f"Tempo total de execucao: {total_time:.1f} segundos ({total_time/60:.1f} minutos)")
-    print(f"Finalizacao: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
+    log.info("\n" + "=" * 70)
+    log.info("RELATORIO FINAL DA PIPELINE KATUBE")
+    log.info("=" * 70)
+    log.info(f"Tempo total de execucao: {total_time:.1f} segundos ({total_time/60:.1f} minutos)")
+    log.info(f"Finalizacao: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    log.info("")
     
     # Conta sucessos e falhas
     steps_executed = 0
@@ -254,115 +386,107 @@ def print_final_summary(pipeline_results: dict, total_time: float):
         else:
             steps_skipped += 1
     
-    print("RESUMO POR ETAPA:")
-    print(f"  Etapas executadas: {steps_executed}")
-    print(f"  Sucessos: {steps_successful}")
-    print(f"  Falhas: {steps_failed}")
-    print(f"  Puladas: {steps_skipped}")
-    print()
+    log.info("RESUMO POR ETAPA:")
+    log.info(f"  Etapas executadas: {steps_executed}")
+    log.info(f"  Sucessos: {steps_successful}")
+    log.info(f"  Falhas: {steps_failed}")
+    log.info(f"  Puladas: {steps_skipped}")
+    log.info("")
     
     # Detalhes por etapa
     for step, result in pipeline_results.items():
         status_icon = "✅" if result["success"] else "❌"
-        print(f"  {status_icon} {step.upper()}: {'SUCESSO' if result['success'] else 'FALHA'}")
+        log.info(f"  {status_icon} {step.upper()}: {'SUCESSO' if result['success'] else 'FALHA'}")
         
         if not result["success"] and "error" in result:
-            print(f"       Erro: {result['error']}")
+            log.error(f"       Erro: {result['error']}")
         
         # Estatisticas especificas por etapa
         if step == "download" and result["success"]:
-            print(f"       Videos baixados: {result.get('stats', {}).get('videos_successful', 'N/A')}")
+            log.info(f"       Videos baixados: {result.get('stats', {}).get('videos_successful', 'N/A')}")
         elif step == "segmentation" and result["success"]:
-            print(f"       Segmentos criados: {result.get('segments_created', 'N/A')}")
+            log.info(f"       Segmentos criados: {result.get('segments_created', 'N/A')}")
         elif step == "validation" and result["success"]:
-            print(f"       Pares aprovados: {result.get('approved_pairs', 'N/A')}")
+            log.info(f"       Pares aprovados: {result.get('approved_pairs', 'N/A')}")
     
-    print()
+    log.info("")
     
     # Verifica resultado final
     validation_ok = pipeline_results.get("validation", {}).get("success", False)
     
     if validation_ok:
-        print("🎉 PIPELINE CONCLUIDA COM SUCESSO!")
-        print("📁 Dataset final disponivel em: output/final_dataset.csv")
-        print("📁 Segmentos de audio em: output/segments/")
-        print()
-        print("PROXIMOS PASSOS:")
-        print("  1. Verificar qualidade do dataset final")
-        print("  2. Usar dataset para treinar modelos TTS/STT") 
-        print("  3. Configurar pipeline para novos dados")
+        log.info("🎉 PIPELINE CONCLUIDA COM SUCESSO!")
+        log.info("📁 Dataset final disponivel em: output/final_dataset.csv")
+        log.info("📁 Segmentos de audio em: output/segments/")
+        log.info("")
+        log.info("PROXIMOS PASSOS:")
+        log.info("  1. Verificar qualidade do dataset final")
+        log.info("  2. Usar dataset para treinar modelos TTS/STT") 
+        log.info("  3. Configurar pipeline para novos dados")
     else:
-        print("⚠️  PIPELINE CONCLUIDA COM PROBLEMAS")
-        print("Verifique os erros acima e ajuste configuracoes se necessario")
+        log.warning("⚠️  PIPELINE CONCLUIDA COM PROBLEMAS")
+        log.warning("Verifique os erros acima e ajuste configuracoes se necessario")
     
-    print("=" * 70)
+    log.info("=" * 70)
+
+
+# Etapas da pipeline: (numero, nome, chave do resultado, flag em PIPELINE_STEPS,
+# secao do config com flag 'enabled' ou None, usa listagem de diretorios, funcao de execucao)
+PIPELINE_STAGES = (
+    (1, "DOWNLOAD", "download", "download", None, False, execute_download_step),
+    (2, "SEGMENTACAO", "segmentation", "segment", None, True, execute_segmentation_step),
+    (3, "TRANSCRICAO", "transcription", "transcribe", None, True, execute_transcription_step),
+    (4, "NORMALIZACAO", "normalization", "normalize", "NORMALIZATION", True, execute_normalization_step),
+    (5, "VALIDACAO", "validation", "validate", None, True, execute_validation_step),
+    (6, "CLEANUP", "cleanup", "cleanup", "CLEANUP", False, execute_cleanup_step),
+)
 
 
 def main():
     """Funcao principal - Executa pipeline completa"""
+    setup_logging()
     print_header()
     
     # Valida configuracoes antes de comecar
-    print("Validando configuracoes...")
+    log.info("Validando configuracoes...")
     if not validate_and_show_config():
-        print("\n❌ Configuracoes invalidas! Corrija src/config.py antes de continuar.")
+        log.error("\n❌ Configuracoes invalidas! Corrija src/config.py antes de continuar.")
         return 1
     
-    print("\n✅ Configuracoes validas! Iniciando pipeline...\n")
+    log.info("\n✅ Configuracoes validas! Iniciando pipeline...\n")
     
     # Controle de execucao
     pipeline_start = time.time()
     pipeline_results = {}
+    steps = default_config.PIPELINE_STEPS
     
-    # ETAPA 1: DOWNLOAD
-    if default_config.PIPELINE_STEPS['download']:
-        print_step_header(1, "DOWNLOAD", True)
-        pipeline_results["download"] = execute_download_step()
-    else:
-        print_step_header(1, "DOWNLOAD", False)
-        print("Etapa desabilitada no config.py")
-    
-    # ETAPA 2: SEGMENTACAO
-    if default_config.PIPELINE_STEPS['segment']:
-        print_step_header(2, "SEGMENTACAO", True)
-        pipeline_results["segmentation"] = execute_segmentation_step()
-    else:
-        print_step_header(2, "SEGMENTACAO", False)
-        print("Etapa desabilitada no config.py")
-    
-    # ETAPA 3: TRANSCRICAO
-    if default_config.PIPELINE_STEPS['transcribe']:
-        print_step_header(3, "TRANSCRICAO", True)
-        pipeline_results["transcription"] = execute_transcription_step()
-    else:
-        print_step_header(3, "TRANSCRICAO", False)
-        print("Etapa desabilitada no config.py")
+    # Segmentacao em paralelo ao download (quando ambas as etapas estao ativas)
+    background_segmenter = None
+    if steps['download'] and steps['segment']:
+        background_segmenter = start_background_segmentation()
+    stage_kwargs = {
+        "download": {"background_segmenter": background_segmenter},
+        "segmentation": {"background_segmenter": background_segmenter},
+    }
     
-    # ETAPA 4: NORMALIZACAO (Opcional)
-    if default_config.PIPELINE_STEPS['normalize'] and default_config.NORMALIZATION['enabled']:
-        print_step_header(4, "NORMALIZACAO", True)
-        pipeline_results["normalization"] = execute_normalization_step()
-    else:
-        print_step_header(4, "NORMALIZACAO", False)
-        reason = "desabilitada no config.py" if not default_config.PIPELINE_STEPS['normalize'] else "NORMALIZATION['enabled'] = False"
-        print(f"Etapa {reason}")
+    # Diretorios de video listados uma unica vez apos o download
+    video_dirs = None
     
-    # ETAPA 5: VALIDACAO
-    if default_config.PIPELINE_STEPS['validate']:
-        print_step_header(5, "VALIDACAO", True)
-        pipeline_results["validation"] = execute_validation_step()
-    else:
-        print_step_header(5, "VALIDACAO", False)
-        print("Etapa desabilitada no config.py")
-    
-    # ETAPA 6: CLEANUP (Opcional)
-    if default_config.PIPELINE_STEPS['cleanup'] and default_config.CLEANUP['enabled']:
-        print_step_header(6, "CLEANUP", True)
-        pipeline_results["cleanup"] = execute_cleanup_step()
-    else:
-        print_step_header(6, "CLEANUP", False)
-        reason = "desabilitada no config.py" if not default_config.PIPELINE_STEPS['cleanup'] else "CLEANUP['enabled'] = False"
-        print(f"Etapa {reason}")
+    for number, name, result_key, step_key, section, uses_video_dirs, execute_step in PIPELINE_STAGES:
+        if not steps[step_key]:
+            print_step_header(number, name, False)
+            log.info("Etapa desabilitada no config.py")
+        elif section and not getattr(default_config, section)['enabled']:
+            print_step_header(number, name, False)
+            log.info(f"Etapa {section}['enabled'] = False")
+        else:
+            print_step_header(number, name, True)
+            kwargs = dict(stage_kwargs.get(result_key, {}))
+            if uses_video_dirs:
+                if video_dirs is None:
+                    video_dirs = list_video_directories("downloads")
+                kwargs["video_dirs"] = video_dirs
+            pipeline_results[result_key] = execute_step(**kwargs)
     
     # Resumo final
     total_time = time.time() - pipeline_start
@@ -378,10 +502,10 @@ if __name__ == "__main__":
         exit_code = main()
         sys.exit(exit_code)
     except KeyboardInterrupt:
-        print("\n\n⚠️ Pipeline interrompida pelo usuario (Ctrl+C)")
-        print("Dados parciais podem estar disponiveis em downloads/ e output/")
+        log.warning("\n\n⚠️ Pipeline interrompida pelo usuario (Ctrl+C)")
+        log.warning("Dados parciais podem estar disponiveis em downloads/ e output/")
         sys.exit(130)
     except Exception as e:
-        print(f"\n💥 Erro critico na pipeline: {e}")
-        print("Verifique configuracoes e dependencias")
+        log.error(f"\n💥 Erro critico na pipeline: {e}")
+        log.error("Verifique configuracoes e dependencias")
         sys.exit(1)
\ No newline at end of file
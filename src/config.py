@@ -6,10 +6,22 @@ Sistema modular para geração de datasets TTS/STT a partir do YouTube
 Versão: 1.0 - Implementação gradual com compatibilidade total
 """
 
+import copy
+import re
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from typing import List, Dict, Optional
 
 
+_YOUTUBE_URL_PATTERN = re.compile(r'youtube\.com|youtu\.be')
+
+
+@lru_cache(maxsize=32)
+def _is_youtube_url(url: str) -> bool:
+    """Verifica (com cache por URL) se a URL pertence ao YouTube"""
+    return _YOUTUBE_URL_PATTERN.search(url) is not None
+
+
 class KatubeConfig:
     """
     Configuração centralizada para todo o pipeline Katube
@@ -44,9 +56,11 @@ class KatubeConfig:
         'audio_format': "mp3",    # Opções: "mp3", "wav", "m4a", "flac"
         'audio_quality': 0,       # kbps: 128, 192, 256, 320 (0 = melhor disponível)
         
-        # Anti-bloqueio (delays entre downloads)
-        'delay_min_seconds': 15,  # Mínimo recomendado: 10s
-        'delay_max_seconds': 30,  # Máximo recomendado: 60s
+        # Anti-bloqueio: inícios de download espaçados em pelo menos delay_min
+        # (o tempo de download conta) + pausa aleatória de 0 a (max - min) antes de cada um
+        'delay_min_seconds': 15,  # Intervalo mínimo entre inícios. Recomendado: 10s
+        'delay_max_seconds': 30,  # min + pausa aleatória máxima. Recomendado: até 60s
+        'max_workers': 1,         # Downloads simultâneos (espaçamento vale entre inícios)
         
         # Legendas
         'subtitle_languages': ["pt-BR", "pt"],  # Prioridade: pt-BR > pt
@@ -73,6 +87,9 @@ class KatubeConfig:
         'sampling_rate': 16000,          # Taxa para análise VAD (Silero padrão)
         'target_sampling_rate': 24000,   # Taxa final dos segmentos salvos  
         'window_size_seconds': 0.15,     # Janela de análise: 150ms
+        # VAD via ONNX Runtime (se instalado) é mais rápido na CPU, mas troca o backend
+        # usado até aqui (TorchScript) - opt-in. Falha de carga ou de inferência volta ao TorchScript
+        'use_onnx': False,
         
         # Controle de qualidade
         'min_silence_for_split': 0.3,    # 300ms de silêncio para divisão
@@ -199,10 +216,40 @@ class KatubeConfig:
         'retry_delay': 60                # Segundos entre tentativas
     }
     
+    # Valores aceitos na validação (configuração interna)
+    _VALID_AUDIO_QUALITIES = frozenset({0, 128, 192, 256, 320})
+    _VALID_AUDIO_FORMATS = frozenset({"mp3", "wav", "m4a", "flac"})
+    
+    # Nível de segurança indexado pelo número de critérios atendidos (0-4)
+    _SAFETY_LEVELS = (
+        "BAIXO (Configuração agressiva)",
+        "BAIXO (Configuração agressiva)",
+        "MÉDIO (Configuração balanceada)",
+        "MÉDIO (Configuração balanceada)",
+        "ALTO (Configuração conservadora)",
+    )
+    
+    # Seções copiadas para cada instância (valores acima são apenas os padrões)
+    _SECTIONS = ('PIPELINE_STEPS', 'DOWNLOAD', 'SEGMENTATION', 'TRANSCRIPTION_FREDS0',
+                 'TRANSCRIPTION_LGRIS', 'NORMALIZATION', 'VALIDATION', 'CLEANUP')
+    
     # ========================================================================
     # MÉTODOS DE VALIDAÇÃO E UTILITÁRIOS
     # ========================================================================
     
+    def __init__(self):
+        """Cria cópias próprias das seções para que overrides não afetem outras instâncias"""
+        for name in self._SECTIONS:
+            setattr(self, name, copy.deepcopy(getattr(type(self), name)))
+    
+    def invalidate_cache(self):
+        """
+        Descarta validação/resumo calculados
+        Deve ser chamado após alterar qualquer seção de configuração
+        """
+        for name in ('_validation_report', '_pipeline_summary', 'safety_level'):
+            self.__dict__.pop(name, None)
+    
     def validate_config(self) -> Dict[str, any]:
         """
         Valida todas as configurações e retorna relatório
@@ -211,6 +258,12 @@ class KatubeConfig:
         Returns:
             Dict: Relatório de validação com erros/avisos
         """
+        # Cópia: alterações do chamador não podem afetar o relatório em cache
+        return copy.deepcopy(self._validation_report)
+    
+    @cached_property
+    def _validation_report(self) -> Dict[str, any]:
+        """Relatório de validação calculado uma única vez (ver invalidate_cache)"""
         validation = {
             'valid': True,
             'errors': [],
@@ -219,22 +272,20 @@ class KatubeConfig:
         
         # Valida URL (se fornecida)
         if self.DOWNLOAD['target_url']:
-            if not any(domain in self.DOWNLOAD['target_url'] for domain in ['youtube.com', 'youtu.be']):
+            if not _is_youtube_url(self.DOWNLOAD['target_url']):
                 validation['errors'].append("URL deve ser do YouTube (youtube.com ou youtu.be)")
                 validation['valid'] = False
         else:
             validation['warnings'].append("URL não configurada - necessária para download")
         
         # Valida qualidade de áudio
-        valid_qualities = [0, 128, 192, 256, 320]
-        if self.DOWNLOAD['audio_quality'] not in valid_qualities:
-            validation['errors'].append(f"Qualidade inválida: {self.DOWNLOAD['audio_quality']}. Use: {valid_qualities}")
+        if self.DOWNLOAD['audio_quality'] not in self._VALID_AUDIO_QUALITIES:
+            validation['errors'].append(f"Qualidade inválida: {self.DOWNLOAD['audio_quality']}. Use: {sorted(self._VALID_AUDIO_QUALITIES)}")
             validation['valid'] = False
         
         # Valida formato de áudio
-        valid_formats = ["mp3", "wav", "m4a", "flac"]
-        if self.DOWNLOAD['audio_format'] not in valid_formats:
-            validation['errors'].append(f"Formato inválido: {self.DOWNLOAD['audio_format']}. Use: {valid_formats}")
+        if self.DOWNLOAD['audio_format'] not in self._VALID_AUDIO_FORMATS:
+            validation['errors'].append(f"Formato inválido: {self.DOWNLOAD['audio_format']}. Use: {sorted(self._VALID_AUDIO_FORMATS)}")
             validation['valid'] = False
         
         # Valida delays
@@ -269,6 +320,11 @@ class KatubeConfig:
         Returns:
             Dict: Resumo formatado das configurações
         """
+        return copy.deepcopy(self._pipeline_summary)
+    
+    @cached_property
+    def _pipeline_summary(self) -> Dict[str, any]:
+        """Resumo do pipeline calculado uma única vez (ver invalidate_cache)"""
         active_steps = [step for step, enabled in self.PIPELINE_STEPS.items() if enabled]
         
         return {
@@ -282,35 +338,25 @@ class KatubeConfig:
             },
             'validation_threshold': f"{self.VALIDATION['similarity_threshold']:.1%}",
             'cleanup_enabled': self.CLEANUP['enabled'],
-            'estimated_safety_level': self._calculate_safety_level()
+            'estimated_safety_level': self.safety_level
         }
     
     def _calculate_safety_level(self) -> str:
         """Calcula nível de segurança baseado nas configurações"""
-        safety_score = 0
-        
-        # Delays adequados
-        if self.DOWNLOAD['delay_min_seconds'] >= 10:
-            safety_score += 1
-        
-        # Não sobrescreve existentes
-        if not self.DOWNLOAD['overwrite_existing']:
-            safety_score += 1
-        
-        # Cleanup desabilitado
-        if not self.CLEANUP['enabled']:
-            safety_score += 1
-        
-        # Threshold conservador
-        if self.VALIDATION['similarity_threshold'] >= 0.7:
-            safety_score += 1
+        return self.safety_level
+    
+    @cached_property
+    def safety_level(self) -> str:
+        """Nível de segurança calculado uma única vez (ver invalidate_cache)"""
+        safety_score = (
+            (self.DOWNLOAD['delay_min_seconds'] >= 10              # Espaçamento adequado
+             and self.DOWNLOAD['delay_max_seconds'] > self.DOWNLOAD['delay_min_seconds'])  # com pausa aleatória
+            + (not self.DOWNLOAD['overwrite_existing'])            # Não sobrescreve existentes
+            + (not self.CLEANUP['enabled'])                        # Cleanup desabilitado
+            + (self.VALIDATION['similarity_threshold'] >= 0.7)     # Threshold conservador
+        )
         
-        if safety_score >= 4:
-            return "ALTO (Configuração conservadora)"
-        elif safety_score >= 2:
-            return "MÉDIO (Configuração balanceada)" 
-        else:
-            return "BAIXO (Configuração agressiva)"
+        return self._SAFETY_LEVELS[safety_score]
 
 
 # ========================================================================
@@ -6,10 +6,13 @@ Integrado com config.py master - Versão KISS
 Compatível com pipeline de dataset para TTS/STT via Streamlit
 """
 
+import copy
 import os
+import re
+from functools import cached_property, lru_cache
 from pathlib import Path
-from urllib.parse import parse_qs, urlparse
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import unquote_plus
 
 # =============================================================================
 # CONFIGURAÇÃO VIA CONFIG.PY - Configuração centralizada
@@ -33,6 +36,7 @@ try:
     AUDIO_QUALITY = default_config.DOWNLOAD['audio_quality']
     DELAY_MIN_SECONDS = default_config.DOWNLOAD['delay_min_seconds']
     DELAY_MAX_SECONDS = default_config.DOWNLOAD['delay_max_seconds']
+    MAX_WORKERS = default_config.DOWNLOAD['max_workers']
     SUBTITLE_LANGUAGES = default_config.DOWNLOAD['subtitle_languages']
     DOWNLOAD_AUTO_SUBS = default_config.DOWNLOAD['download_auto_subs']
     MIN_DURATION_SECONDS = default_config.DOWNLOAD['min_duration_seconds']
@@ -66,6 +70,7 @@ except ImportError as e:
     AUDIO_QUALITY = 0
     DELAY_MIN_SECONDS = 15
     DELAY_MAX_SECONDS = 30
+    MAX_WORKERS = 1
     SUBTITLE_LANGUAGES = ["pt-BR", "pt"]
     DOWNLOAD_AUTO_SUBS = True
     MIN_DURATION_SECONDS = 30
@@ -87,6 +92,42 @@ except ImportError as e:
 
 # =============================================================================
 
+# Classificação de URL em uma única regex compilada
+# Alternativas avaliadas na mesma ordem de prioridade: playlist > handle >
+# canal > vídeo > URL encurtada (o lookahead permite o padrão em qualquer posição)
+_URL_TYPE_PATTERN = re.compile(
+    r'(?=.*?(?:playlist\?|&)list=(?P<playlist>[^&#]+))'
+    r'|(?=.*?/@(?P<handle>[^/?]*))'
+    r'|(?=.*?/channel/(?P<channel>[^/?]*))'
+    r'|(?=.*?watch\?v=(?P<watch>[^&#]+))'
+    r'|(?=.*?youtu\.be/(?P<short>[^?]*))',
+    re.DOTALL
+)
+
+# Prefixos de URL encurtada tratados sem regex em _detect_url_type
+_SHORT_URL_PREFIXES = ('https://youtu.be/', 'http://youtu.be/', 'youtu.be/')
+
+# Parte fixa do comando yt-dlp (não depende da configuração)
+_YTDLP_STATIC_ARGS = (
+    "yt-dlp",
+    "--write-subs",       # Legendas manuais
+    "--write-auto-subs",  # Legendas automáticas
+    "--ignore-errors",    # Continua mesmo com erros
+    "--no-warnings",      # Reduz logs desnecessários
+)
+
+# Grupo da regex -> tipo de conteúdo
+_URL_GROUP_TYPES = {
+    'playlist': 'playlist',
+    'handle': 'channel',
+    'channel': 'channel',
+    'watch': 'video',
+    'short': 'video',
+}
+
+# Grupos vindos da query string: decodificados como parse_qs fazia
+_URL_QUERY_GROUPS = frozenset({'playlist', 'watch'})
+
 
 class DownloadConfig:
     """
@@ -94,6 +135,10 @@ class DownloadConfig:
     Agora integrada com config.py master - Filosofia KISS
     """
     
+    # Valores aceitos na validação
+    _VALID_AUDIO_QUALITIES = frozenset({0, 128, 192, 256, 320})
+    _VALID_AUDIO_FORMATS = frozenset({"mp3", "wav", "m4a", "flac"})
+    
     def __init__(self, target_url: Optional[str] = None):
         """
         Inicializa configuração com URL opcional
@@ -108,6 +153,7 @@ class DownloadConfig:
         self.AUDIO_QUALITY = AUDIO_QUALITY
         self.DELAY_MIN_SECONDS = DELAY_MIN_SECONDS
         self.DELAY_MAX_SECONDS = DELAY_MAX_SECONDS
+        self.MAX_WORKERS = MAX_WORKERS
         self.SUBTITLE_LANGUAGES = SUBTITLE_LANGUAGES
         self.DOWNLOAD_AUTO_SUBS = DOWNLOAD_AUTO_SUBS
         self.MIN_DURATION_SECONDS = MIN_DURATION_SECONDS
@@ -125,47 +171,59 @@ class DownloadConfig:
         self.url_type, self.content_id = self._detect_url_type(self.target_url)
         self.output_dir = self._create_output_path()
         
+        # Template de saída do yt-dlp (downloads/tipo_id/video_id/video_id.ext)
+        self.output_template = str(self.output_dir / "%(id)s" / "%(id)s.%(ext)s")
+        
+        # Versão str da pasta de saída para verificações de existência (sem Path)
+        self._output_dir_str = str(self.output_dir)
+        
+        # Caminhos por vídeo calculados sob demanda e reaproveitados
+        self._video_path_cache = {}
+        self._audio_path_cache = {}
+        
         # Arquivos de controle
         self.videos_list_file = self.output_dir / "youtube_videos.txt"
         self.error_log_file = self.output_dir / "download_errors.json"
         self.success_log_file = self.output_dir / "download_success.json"
         
-        # Garante que diretório existe
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Garante que diretório existe (EAFP: uma única chamada quando já existe)
+        try:
+            os.mkdir(self.output_dir)
+        except FileExistsError:
+            # Arquivo comum com o mesmo nome não serve como pasta de saída
+            if not os.path.isdir(self.output_dir):
+                raise
+        except FileNotFoundError:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def _detect_url_type(self, url: str) -> tuple:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _detect_url_type(url: str) -> tuple:
         """
         Detecta tipo de URL YouTube e extrai ID único
+        Resultado em cache por URL (mesma URL é reanalisada a cada rerun do Streamlit)
         
         Returns:
             tuple: (tipo, id) - 'channel', 'playlist' ou 'video'
         """
-        # Playlist
-        if 'playlist?list=' in url or '&list=' in url:
-            playlist_id = parse_qs(urlparse(url).query).get('list', [None])[0]
-            if playlist_id:
-                return 'playlist', playlist_id
-        
-        # Canal por handle (@usuario)
-        if '/@' in url:
-            handle = url.split('/@')[1].split('/')[0].split('?')[0]
-            return 'channel', handle
-        
-        # Canal por ID (UC...)
-        if '/channel/' in url:
-            channel_id = url.split('/channel/')[1].split('/')[0].split('?')[0]
-            return 'channel', channel_id
-        
-        # Vídeo individual
-        if 'watch?v=' in url:
-            video_id = parse_qs(urlparse(url).query).get('v', [None])[0]
-            if video_id:
-                return 'video', video_id
-        
-        # URL encurtada
-        if 'youtu.be/' in url:
-            video_id = url.split('youtu.be/')[1].split('?')[0]
-            return 'video', video_id
+        # Espaços nas pontas (colagem na UI) eram descartados pelo urlparse
+        url = url.strip()
+        
+        # Entrada claramente inválida: curta demais (ID de vídeo tem 11 caracteres) ou não-YouTube
+        if len(url) < 11 or 'youtu' not in url:
+            raise ValueError(f"Tipo de URL não reconhecido: {url}")
+        
+        # Caminho rápido: URL encurtada (youtu.be/ID) sem playlist associada
+        if len(url) < 32 and url.startswith(_SHORT_URL_PREFIXES) and 'list=' not in url:
+            return 'video', url.partition('youtu.be/')[2].split('?', 1)[0]
+        
+        match = _URL_TYPE_PATTERN.match(url)
+        if match:
+            group = match.lastgroup
+            content_id = match.group(group)
+            if group in _URL_QUERY_GROUPS:
+                content_id = unquote_plus(content_id)
+            return _URL_GROUP_TYPES[group], content_id
         
         raise ValueError(f"Tipo de URL não reconhecido: {url}")
     
@@ -186,17 +244,30 @@ class DownloadConfig:
         Retorna caminho completo para arquivos de um vídeo
         Estrutura: downloads/tipo_id/video_id/
         """
-        return self.output_dir / video_id
+        path = self._video_path_cache.get(video_id)
+        if path is None:
+            path = self._video_path_cache[video_id] = self.output_dir / video_id
+        return path
     
     def get_audio_file_path(self, video_id: str) -> Path:
         """Retorna caminho para arquivo de áudio"""
         extension = self.AUDIO_FORMAT
-        return self.get_video_output_path(video_id) / f"{video_id}.{extension}"
+        
+        # Formato faz parte da chave: AUDIO_FORMAT pode ser alterado após __init__
+        key = (video_id, extension)
+        path = self._audio_path_cache.get(key)
+        if path is None:
+            path = self._audio_path_cache[key] = self.get_video_output_path(video_id) / f"{video_id}.{extension}"
+        return path
     
     def get_subtitle_file_path(self, video_id: str) -> Path:
         """Retorna caminho para arquivo de legenda"""
         return self.get_video_output_path(video_id) / f"{video_id}.srt"
     
+    def _audio_file_path_str(self, video_id: str) -> str:
+        """Caminho do áudio como str (verificações em massa, sem criar Path)"""
+        return os.path.join(self._output_dir_str, video_id, f"{video_id}.{self.AUDIO_FORMAT}")
+    
     def is_video_downloaded(self, video_id: str) -> bool:
         """
         Verifica se vídeo já foi baixado (evita duplicatas)
@@ -205,8 +276,60 @@ class DownloadConfig:
         Returns:
             bool: True se áudio já existe
         """
-        audio_file = self.get_audio_file_path(video_id)
-        return audio_file.exists() and audio_file.stat().st_size > 1024  # Mínimo 1KB
+        try:
+            return os.stat(self._audio_file_path_str(video_id)).st_size > 1024  # Mínimo 1KB
+        except FileNotFoundError:
+            return False
+    
+    def get_downloaded_video_ids(self, video_ids: Iterable[str]) -> Set[str]:
+        """
+        Verifica em lote quais vídeos já foram baixados
+        Lista a pasta de saída uma vez e só consulta o áudio dos vídeos
+        que já têm diretório (mesmo critério de is_video_downloaded)
+        
+        Args:
+            video_ids: IDs a verificar
+            
+        Returns:
+            Set[str]: IDs cujo áudio já existe
+        """
+        try:
+            with os.scandir(self._output_dir_str) as entries:
+                existing_dirs = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            return set()
+        
+        downloaded = set()
+        for video_id in existing_dirs.intersection(video_ids):
+            try:
+                if os.stat(self._audio_file_path_str(video_id)).st_size > 1024:  # Mínimo 1KB
+                    downloaded.add(video_id)
+            except OSError:
+                continue
+        
+        return downloaded
+    
+    def get_audio_extraction_args(self) -> List[str]:
+        """
+        Argumentos yt-dlp para extração de áudio
+        Em formatos nativos do YouTube (m4a) seleciona o stream no mesmo
+        container, assim o ffmpeg apenas copia o áudio (sem re-encode)
+        
+        Returns:
+            List[str]: Argumentos de formato/extração
+        """
+        args = []
+        
+        native_selector = NATIVE_AUDIO_FORMATS.get(self.AUDIO_FORMAT)
+        if native_selector:
+            args.extend(["-f", native_selector])
+        
+        # Qualidade sempre explícita: se o seletor nativo cair no fallback
+        # (stream não-AAC) o ffmpeg transcodifica, e sem ela usaria o padrão 5
+        args.extend(["-x", "--audio-format", self.AUDIO_FORMAT,
+                     "--audio-quality", str(self.AUDIO_QUALITY)])
+        
+        return args
     
     def get_ytdlp_command_args(self) -> List[str]:
         """
@@ -217,24 +340,16 @@ class DownloadConfig:
             List[str]: Lista de argumentos para subprocess
         """
         args = [
-            "yt-dlp",
+            *_YTDLP_STATIC_ARGS,
             
-            # Extração de áudio
-            "-x",  # Extrair áudio apenas
-            "--audio-format", self.AUDIO_FORMAT,
-            "--audio-quality", str(self.AUDIO_QUALITY),
+            # Extração de áudio (-x)
+            *self.get_audio_extraction_args(),
             
-            # Download de legendas
-            "--write-subs",      # Legendas manuais
-            "--write-auto-subs", # Legendas automáticas
+            # Idiomas das legendas
             "--sub-lang", ",".join(self.SUBTITLE_LANGUAGES),
             
             # Template de output (estrutura de pastas)
-            "--output", str(self.output_dir / "%(id)s" / "%(id)s.%(ext)s"),
-            
-            # Controle de download
-            "--ignore-errors",   # Continua mesmo com erros
-            "--no-warnings",     # Reduz logs desnecessários
+            "--output", self.output_template,
         ]
         
         # Adiciona limite se configurado
@@ -253,6 +368,14 @@ class DownloadConfig:
         
         return args
     
+    def invalidate_cache(self):
+        """
+        Descarta validação/resumo calculados
+        Deve ser chamado após alterar atributos de configuração
+        """
+        for name in ('_validation_report', '_summary'):
+            self.__dict__.pop(name, None)
+    
     def validate_config(self) -> Dict[str, any]:
         """
         Valida configurações e retorna relatório
@@ -260,6 +383,12 @@ class DownloadConfig:
         Returns:
             Dict: Relatório de validação com erros/avisos
         """
+        # Cópia: alterações do chamador não podem afetar o relatório em cache
+        return copy.deepcopy(self._validation_report)
+    
+    @cached_property
+    def _validation_report(self) -> Dict[str, any]:
+        """Relatório de validação calculado uma única vez (ver invalidate_cache)"""
         validation = {
             'valid': True,
             'errors': [],
@@ -267,15 +396,13 @@ class DownloadConfig:
         }
         
         # Valida qualidade de áudio
-        valid_qualities = [0, 128, 192, 256, 320]
-        if self.AUDIO_QUALITY not in valid_qualities:
-            validation['errors'].append(f"Qualidade inválida: {self.AUDIO_QUALITY}. Use: {valid_qualities}")
+        if self.AUDIO_QUALITY not in self._VALID_AUDIO_QUALITIES:
+            validation['errors'].append(f"Qualidade inválida: {self.AUDIO_QUALITY}. Use: {sorted(self._VALID_AUDIO_QUALITIES)}")
             validation['valid'] = False
         
         # Valida formato de áudio
-        valid_formats = ["mp3", "wav", "m4a", "flac"]
-        if self.AUDIO_FORMAT not in valid_formats:
-            validation['errors'].append(f"Formato inválido: {self.AUDIO_FORMAT}. Use: {valid_formats}")
+        if self.AUDIO_FORMAT not in self._VALID_AUDIO_FORMATS:
+            validation['errors'].append(f"Formato inválido: {self.AUDIO_FORMAT}. Use: {sorted(self._VALID_AUDIO_FORMATS)}")
             validation['valid'] = False
         
         # Valida delays
@@ -283,6 +410,11 @@ class DownloadConfig:
             validation['errors'].append("DELAY_MIN deve ser menor que DELAY_MAX")
             validation['valid'] = False
         
+        # Valida paralelismo
+        if self.MAX_WORKERS < 1:
+            validation['errors'].append(f"MAX_WORKERS inválido: {self.MAX_WORKERS}. Use 1 ou mais")
+            validation['valid'] = False
+        
         # Avisos úteis
         if self.DOWNLOAD_LIMIT == 0:
             validation['warnings'].append("DOWNLOAD_LIMIT = 0: Baixará TODOS os vídeos")
@@ -300,6 +432,11 @@ class DownloadConfig:
         Returns:
             Dict: Resumo formatado das configurações
         """
+        return copy.deepcopy(self._summary)
+    
+    @cached_property
+    def _summary(self) -> Dict:
+        """Resumo das configurações calculado uma única vez (ver invalidate_cache)"""
         return {
             'url_original': self.target_url,
             'tipo_detectado': self.url_type,
@@ -329,6 +466,12 @@ CONTENT_FILTERS = {
     'skip_shorts': False,           # Pula YouTube Shorts
 }
 
+# Formatos de áudio servidos nativamente pelo YouTube: seletor de stream
+# que evita re-encode no ffmpeg (apenas cópia do áudio)
+NATIVE_AUDIO_FORMATS = {
+    'm4a': "bestaudio[ext=m4a]/bestaudio/best",
+}
+
 # Configurações de retry
 RETRY_CONFIG = {
     'max_retries': 3,               # Tentativas por vídeo
@@ -6,16 +6,84 @@ Executa downloads unificados de áudio + legendas com verificação de duplicata
 Preparado para integração com Streamlit
 """
 
+import copy
 import subprocess
 import json
+import tempfile
+import threading
 import time
 import os
+import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from random import randint
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Set, Tuple, Optional
 
-from .download_config import DownloadConfig, create_config_instance
+from .download_config import DownloadConfig, NATIVE_AUDIO_FORMATS, create_config_instance
+
+# Arquivos temporários deixados pelo yt-dlp
+_TEMP_FILE_SUFFIXES = ('.part', '.ytdl', '.tmp')
+
+# Sufixos de legenda gerados pelo yt-dlp, em ordem de prioridade
+_SUBTITLE_SUFFIXES = ('.pt-BR.srt', '.pt.srt', '.pt-BR.vtt', '.pt.vtt')
+
+
+def _load_yt_dlp():
+    """
+    Importa a API Python do yt-dlp sob demanda (import pesado)
+    Só é chamada quando downloads vão de fato acontecer
+    
+    Returns:
+        Módulo yt_dlp ou None se não estiver instalado (usa subprocesso)
+    """
+    try:
+        import yt_dlp
+    except ImportError:
+        return None
+    return yt_dlp
+
+
+class TokenBucket:
+    """
+    Limitador de taxa (token bucket) compartilhável entre threads
+    Cada download consome um token; tokens são repostos a taxa constante
+    """
+    
+    def __init__(self, rate_per_sec: float, capacity: int = 1):
+        """
+        Args:
+            rate_per_sec: Tokens repostos por segundo
+            capacity: Máximo de tokens acumulados (rajada permitida)
+        """
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Bloqueia até haver um token disponível e o consome
+        
+        Returns:
+            float: Segundos aguardados
+        """
+        waited = 0.0
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate_per_sec)
+                self._last_refill = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                
+                wait = (1 - self._tokens) / self.rate_per_sec
+            
+            time.sleep(wait)
+            waited += wait
 
 
 class DownloadManager:
@@ -24,14 +92,37 @@ class DownloadManager:
     Usa yt-dlp para download unificado de áudio e legendas
     """
     
-    def __init__(self, config: Optional[DownloadConfig] = None):
+    def __init__(self, config: Optional[DownloadConfig] = None,
+                 on_video_downloaded: Optional[Callable[[str, Path], None]] = None):
         """
         Inicializa gerenciador com configuração
         
         Args:
             config: Configuração personalizada (usa padrão se None)
+            on_video_downloaded: Callback chamado com (video_id, caminho_audio)
+                a cada download bem-sucedido - permite iniciar etapas
+                seguintes sem esperar o fim de todos os downloads
         """
         self.config = config or create_config_instance()
+        self.on_video_downloaded = on_video_downloaded
+        
+        # Anti-bloqueio: no máximo um início a cada DELAY_MIN, mais pausa aleatória
+        # de até (DELAY_MAX - DELAY_MIN) antes de cada token - intervalos não ficam regulares
+        min_delay = self.config.DELAY_MIN_SECONDS
+        self.rate_limiter = TokenBucket(1.0 / min_delay) if min_delay > 0 else None
+        self.delay_jitter = max(0, self.config.DELAY_MAX_SECONDS - min_delay)
+        
+        # Protege stats/logs quando há downloads simultâneos
+        self._stats_lock = threading.Lock()
+        
+        # Prefixo do comando yt-dlp (montado no início dos downloads)
+        self._download_cmd_prefix = None
+        
+        # Opções da API Python do yt-dlp e uma instância por thread
+        self._yt_dlp = None
+        self._ydl_opts = None
+        self._ydl_local = threading.local()
+        self._ydl_instances = []
         
         # Estatísticas de execução
         self.stats = {
@@ -42,6 +133,7 @@ class DownloadManager:
             'videos_successful': 0,
             'videos_failed': 0,
             'videos_skipped': 0,
+            'videos_filtered_duration': 0,
             'audio_files_created': 0,
             'subtitle_files_created': 0
         }
@@ -117,29 +209,67 @@ class DownloadManager:
             extract_cmd = [
                 "yt-dlp",
                 "--flat-playlist",    # Só extrai URLs, não baixa
-                "--print", "id",      # Imprime apenas IDs
+                "--print", "%(id)s %(duration)s",  # ID + duração (já vem na listagem)
                 "--quiet",            # Sem logs extras
                 self.config.target_url
             ]
             
-            # Adiciona limite se configurado
-            if self.config.DOWNLOAD_LIMIT > 0:
-                extract_cmd.extend(["--playlist-end", str(self.config.DOWNLOAD_LIMIT)])
+            # Limite aplicado após o filtro de duração (não via --playlist-end),
+            # assim vídeos filtrados não reduzem a quantidade pedida
+            limit = self.config.DOWNLOAD_LIMIT
+            
+            # Processa IDs conforme o yt-dlp os imprime (sem acumular a saída inteira)
+            # dict preserva a ordem e remove repetidos
+            video_ids = {}
+            filtered_count = 0
+            limit_reached = False
+            
+            # stderr vai para arquivo temporário: não bloqueia o pipe e fica
+            # disponível para diagnóstico (URL inválida, 429, bloqueio regional)
+            stderr_file = tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace')
+            
+            with stderr_file, subprocess.Popen(extract_cmd, stdout=subprocess.PIPE, stderr=stderr_file,
+                                               text=True) as process:
+                for line in process.stdout:
+                    fields = line.split()
+                    if not fields:
+                        continue
+                    
+                    # Aplica filtro de duração
+                    if len(fields) > 1 and not self._is_duration_allowed(fields[1]):
+                        filtered_count += 1
+                        continue
+                    
+                    video_ids[fields[0]] = None
+                    
+                    if limit > 0 and len(video_ids) >= limit:
+                        limit_reached = True
+                        process.terminate()
+                        break
+                
+                process.wait()
+                stderr_file.seek(0)
+                error_output = stderr_file.read().strip()
             
-            # Executa comando
-            result = subprocess.run(extract_cmd, capture_output=True, text=True, check=True)
+            if process.returncode != 0 and not limit_reached:
+                raise subprocess.CalledProcessError(process.returncode, extract_cmd, stderr=error_output)
             
-            # Processa IDs retornados
-            all_video_ids = [line.strip() for line in result.stdout.split('\n') if line.strip()]
+            all_video_ids = list(video_ids)
             
             print(f"Total de vídeos encontrados: {len(all_video_ids)}")
             
-            # Aplica verificação de duplicatas
+            if filtered_count > 0:
+                self.stats['videos_filtered_duration'] += filtered_count
+                print(f"⏱️ Ignorando {filtered_count} vídeos fora da duração "
+                      f"{self._describe_duration_range()}")
+            
+            # Aplica verificação de duplicatas (uma listagem da pasta para todos os IDs)
+            already_downloaded = self.config.get_downloaded_video_ids(all_video_ids)
             new_video_ids = []
             skipped_count = 0
             
             for video_id in all_video_ids:
-                if self.config.is_video_downloaded(video_id):
+                if video_id in already_downloaded:
                     skipped_count += 1
                     self.stats['videos_skipped'] += 1
                 else:
@@ -157,11 +287,50 @@ class DownloadManager:
             
         except subprocess.CalledProcessError as e:
             print(f"❌ Erro ao extrair lista de vídeos: {e}")
+            if e.stderr:
+                print(f"   yt-dlp: {e.stderr}")
             return []
         except Exception as e:
             print(f"❌ Erro inesperado na extração: {e}")
             return []
     
+    def _is_duration_allowed(self, duration: str) -> bool:
+        """
+        Verifica duração informada na listagem contra os limites configurados
+        Vídeos sem duração conhecida ("NA") são mantidos
+        
+        Args:
+            duration: Duração em segundos como texto impresso pelo yt-dlp
+            
+        Returns:
+            bool: True se o vídeo deve ser baixado
+        """
+        try:
+            seconds = float(duration)
+        except ValueError:
+            return True
+        
+        # 0 = sem limite (mesma regra dos --match-filter em DownloadConfig)
+        min_seconds = self.config.MIN_DURATION_SECONDS
+        max_seconds = self.config.MAX_DURATION_SECONDS
+        
+        if min_seconds > 0 and seconds < min_seconds:
+            return False
+        if max_seconds > 0 and seconds > max_seconds:
+            return False
+        return True
+    
+    def _describe_duration_range(self) -> str:
+        """Texto do intervalo de duração configurado (0 = sem limite)"""
+        min_seconds = self.config.MIN_DURATION_SECONDS
+        max_seconds = self.config.MAX_DURATION_SECONDS
+        
+        if min_seconds > 0 and max_seconds > 0:
+            return f"{min_seconds}-{max_seconds}s"
+        if min_seconds > 0:
+            return f">= {min_seconds}s"
+        return f"<= {max_seconds}s"
+    
     def _execute_downloads_with_delays(self, video_ids: List[str]) -> List[str]:
         """
         Executa downloads com delays anti-bloqueio
@@ -172,34 +341,215 @@ class DownloadManager:
         Returns:
             List[str]: IDs dos downloads bem-sucedidos
         """
-        successful_downloads = []
+        total = len(video_ids)
+        max_workers = self.config.MAX_WORKERS
+        
+        # Parte fixa do comando montada uma vez por execução
+        self._download_cmd_prefix = self._build_download_cmd_prefix()
+        self._ydl_opts = self._build_ydl_opts()
+        self._ydl_local = threading.local()
         
-        print(f"\n⬇️ Iniciando download de {len(video_ids)} vídeos...")
+        print(f"\n⬇️ Iniciando download de {total} vídeos...")
         print(f"Delay configurado: {self.config.DELAY_MIN_SECONDS}-{self.config.DELAY_MAX_SECONDS}s")
         
-        for i, video_id in enumerate(video_ids, 1):
-            print(f"\n[{i}/{len(video_ids)}] Baixando: {video_id}")
+        try:
+            if max_workers <= 1:
+                results = [self._download_with_rate_limit(i, total, video_id)
+                           for i, video_id in enumerate(video_ids, 1)]
+            else:
+                # Downloads simultâneos: o token bucket compartilhado mantém o
+                # intervalo anti-bloqueio entre inícios de download
+                print(f"Downloads simultâneos: {max_workers}")
+                
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    futures = [pool.submit(self._download_with_rate_limit, i, total, video_id)
+                               for i, video_id in enumerate(video_ids, 1)]
+                    try:
+                        results = [future.result() for future in futures]
+                    except KeyboardInterrupt:
+                        for future in futures:
+                            future.cancel()
+                        raise
+        finally:
+            self._close_ydl_instances()
+        
+        # Mantém a ordem original dos vídeos
+        return [video_id for video_id, success in zip(video_ids, results) if success]
+    
+    def _download_with_rate_limit(self, index: int, total: int, video_id: str) -> bool:
+        """
+        Aguarda o limitador anti-bloqueio e baixa um vídeo
+        Seguro para execução em várias threads
+        
+        Args:
+            index: Posição do vídeo na fila (1-based, para exibição)
+            total: Total de vídeos na fila
+            video_id: ID do vídeo
             
+        Returns:
+            bool: True se download bem-sucedido
+        """
+        # Delay anti-bloqueio: pausa aleatória (aplicada mesmo após downloads longos)
+        # e depois o token - obtido imediatamente antes do início, garante DELAY_MIN
+        # entre inícios (tempo de download já conta no intervalo)
+        waited = 0.0
+        if self.delay_jitter > 0:
+            waited = random.uniform(0, self.delay_jitter)
+            time.sleep(waited)
+        if self.rate_limiter:
+            waited += self.rate_limiter.acquire()
+        if waited > 0:
+            print(f"⏳ Aguardou {waited:.1f}s (anti-bloqueio)")
+        
+        print(f"\n[{index}/{total}] Baixando: {video_id}")
+        
+        with self._stats_lock:
             self.stats['videos_attempted'] += 1
+        
+        # Executa download individual
+        success = self._download_single_video(video_id)
+        
+        with self._stats_lock:
+            self.stats['videos_successful' if success else 'videos_failed'] += 1
+        
+        if success:
+            print(f"✅ Sucesso: {video_id}")
+            self._notify_video_downloaded(video_id)
+        else:
+            print(f"❌ Falha: {video_id}")
+        
+        return success
+    
+    def _notify_video_downloaded(self, video_id: str) -> None:
+        """
+        Repassa video recém-baixado para o callback configurado
+        Falhas no callback não interrompem os downloads
+        
+        Args:
+            video_id: ID do vídeo baixado com sucesso
+        """
+        if self.on_video_downloaded is None:
+            return
+        
+        try:
+            self.on_video_downloaded(video_id, self.config.get_audio_file_path(video_id))
+        except Exception as e:
+            print(f"⚠️ Erro no callback pós-download de {video_id}: {e}")
+    
+    def _build_download_cmd_prefix(self) -> Tuple[str, ...]:
+        """
+        Monta a parte do comando yt-dlp comum a todos os vídeos da execução
+        
+        Returns:
+            Tuple[str, ...]: Argumentos sem a URL do vídeo
+        """
+        return (
+            "yt-dlp",
             
-            # Executa download individual
-            success = self._download_single_video(video_id)
+            # Extração de áudio (sem re-encode em formatos nativos)
+            *self.config.get_audio_extraction_args(),
             
-            if success:
-                successful_downloads.append(video_id)
-                self.stats['videos_successful'] += 1
-                print(f"✅ Sucesso: {video_id}")
-            else:
-                self.stats['videos_failed'] += 1
-                print(f"❌ Falha: {video_id}")
+            # Download de legendas
+            "--write-subs",
+            "--write-auto-subs",
+            "--sub-lang", ",".join(self.config.SUBTITLE_LANGUAGES),
+            
+            # Output por vídeo (%(id)s resolve para video_id)
+            "--output", self.config.output_template,
+            
+            # Controle de erros
+            "--ignore-errors",
+            "--quiet",
+        )
+    
+    def _build_ydl_opts(self) -> Optional[Dict]:
+        """
+        Converte o prefixo do comando em opções da API Python do yt-dlp
+        Usa o próprio parser da CLI, mantendo o mesmo comportamento do subprocesso
+        
+        Returns:
+            Dict: Opções para YoutubeDL ou None se a API não estiver disponível
+        """
+        if self._yt_dlp is None:
+            self._yt_dlp = _load_yt_dlp()
+        
+        yt_dlp = self._yt_dlp
+        if yt_dlp is None or not hasattr(yt_dlp, 'parse_options'):
+            return None
+        
+        # parse_options sinaliza argumentos inválidos com SystemExit (argparse/optparse)
+        try:
+            ydl_opts = yt_dlp.parse_options(list(self._download_cmd_prefix[1:])).ydl_opts
+        except (Exception, SystemExit) as e:
+            print(f"⚠️ API do yt-dlp indisponível, usando subprocesso: {e}")
+            return None
+        
+        mismatches = self._ydl_opts_mismatches(ydl_opts)
+        if mismatches:
+            print(f"⚠️ Opções da API divergem da CLI ({', '.join(mismatches)}), usando subprocesso")
+            return None
+        
+        return ydl_opts
+    
+    def _ydl_opts_mismatches(self, ydl_opts: Dict) -> List[str]:
+        """
+        Confere as opções convertidas contra a configuração usada na CLI
+        
+        Args:
+            ydl_opts: Opções retornadas por parse_options
             
-            # Delay anti-bloqueio (exceto no último)
-            if i < len(video_ids):
-                delay = randint(self.config.DELAY_MIN_SECONDS, self.config.DELAY_MAX_SECONDS)
-                print(f"⏳ Aguardando {delay}s (anti-bloqueio)...")
-                time.sleep(delay)
+        Returns:
+            List[str]: Nomes das opções divergentes (vazia se tudo confere)
+        """
+        outtmpl = ydl_opts.get('outtmpl')
+        if isinstance(outtmpl, dict):
+            outtmpl = outtmpl.get('default')
+        
+        extract_audio = [pp for pp in ydl_opts.get('postprocessors') or ()
+                         if pp.get('key') == 'FFmpegExtractAudio']
+        
+        expected = {
+            'audio-format': (extract_audio and extract_audio[0].get('preferredcodec'), self.config.AUDIO_FORMAT),
+            'audio-quality': (extract_audio and str(extract_audio[0].get('preferredquality')),
+                              str(self.config.AUDIO_QUALITY)),
+            'write-subs': (bool(ydl_opts.get('writesubtitles')), True),
+            'write-auto-subs': (bool(ydl_opts.get('writeautomaticsub')), True),
+            'sub-lang': (list(ydl_opts.get('subtitleslangs') or ()), list(self.config.SUBTITLE_LANGUAGES)),
+            'output': (outtmpl, self.config.output_template),
+            'ignore-errors': (bool(ydl_opts.get('ignoreerrors')), True),
+            'quiet': (bool(ydl_opts.get('quiet')), True),
+        }
+        
+        # Sem -f o formato fica a cargo do yt-dlp (mesmo padrão na CLI)
+        native_selector = NATIVE_AUDIO_FORMATS.get(self.config.AUDIO_FORMAT)
+        if native_selector:
+            expected['format'] = (ydl_opts.get('format'), native_selector)
         
-        return successful_downloads
+        return [name for name, (actual, wanted) in expected.items() if actual != wanted]
+    
+    def _get_thread_ydl(self):
+        """
+        Instância YoutubeDL da thread atual (YoutubeDL não é thread-safe)
+        Criada uma vez e reaproveitada entre os vídeos da thread
+        Cada instância recebe sua própria cópia das opções (YoutubeDL altera o dict)
+        """
+        ydl = getattr(self._ydl_local, 'ydl', None)
+        if ydl is None:
+            ydl = self._ydl_local.ydl = self._yt_dlp.YoutubeDL(copy.deepcopy(self._ydl_opts))
+            with self._stats_lock:
+                self._ydl_instances.append(ydl)
+        return ydl
+    
+    def _close_ydl_instances(self) -> None:
+        """Fecha instâncias YoutubeDL criadas durante a execução"""
+        with self._stats_lock:
+            instances, self._ydl_instances = self._ydl_instances, []
+        
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception as e:
+                print(f"⚠️ Erro ao fechar yt-dlp: {e}")
     
     def _download_single_video(self, video_id: str) -> bool:
         """
@@ -214,47 +564,33 @@ class DownloadManager:
         video_url = f"https://www.youtube.com/watch?v={video_id}"
         
         try:
-            # Constrói comando yt-dlp específico para este vídeo
-            cmd_args = [
-                "yt-dlp",
-                
-                # Extração de áudio
-                "-x",
-                "--audio-format", self.config.AUDIO_FORMAT,
-                "--audio-quality", str(self.config.AUDIO_QUALITY),
-                
-                # Download de legendas
-                "--write-subs",
-                "--write-auto-subs", 
-                "--sub-lang", ",".join(self.config.SUBTITLE_LANGUAGES),
-                
-                # Output específico para este vídeo
-                "--output", str(self.config.get_video_output_path(video_id) / f"{video_id}.%(ext)s"),
-                
-                # Controle de erros
-                "--ignore-errors",
-                "--quiet",
-                
-                # URL do vídeo
-                video_url
-            ]
-            
-            # Executa download
-            result = subprocess.run(cmd_args, capture_output=True, text=True, check=False)
+            # Comando yt-dlp: parte comum da execução + URL deste vídeo
+            if self._download_cmd_prefix is None:
+                self._download_cmd_prefix = self._build_download_cmd_prefix()
+            cmd_args = [*self._download_cmd_prefix, video_url]
+            
+            # Executa download (API Python quando disponível, senão subprocesso)
+            if self._ydl_opts is not None:
+                self._get_thread_ydl().download([video_url])
+            else:
+                subprocess.run(cmd_args, capture_output=True, text=True, check=False)
             
             # Verifica se arquivos foram criados
             audio_file = self.config.get_audio_file_path(video_id)
             subtitle_file = self.config.get_subtitle_file_path(video_id)
             
-            # Valida resultado
-            audio_ok = audio_file.exists() and audio_file.stat().st_size > 1024
-            subtitle_ok = subtitle_file.exists() and subtitle_file.stat().st_size > 0
-            
-            if audio_ok:
-                self.stats['audio_files_created'] += 1
+            # Valida resultado (um stat por arquivo, reaproveitado no log)
+            audio_size = self._file_size(audio_file)
+            subtitle_size = self._file_size(subtitle_file)
+            audio_ok = audio_size > 1024
+            subtitle_ok = subtitle_size > 0
             
-            if subtitle_ok:
-                self.stats['subtitle_files_created'] += 1
+            with self._stats_lock:
+                if audio_ok:
+                    self.stats['audio_files_created'] += 1
+                
+                if subtitle_ok:
+                    self.stats['subtitle_files_created'] += 1
             
             # Log do resultado
             download_result = {
@@ -262,8 +598,8 @@ class DownloadManager:
                 'timestamp': datetime.now().isoformat(),
                 'audio_downloaded': audio_ok,
                 'subtitle_downloaded': subtitle_ok,
-                'audio_size_mb': round(audio_file.stat().st_size / (1024*1024), 2) if audio_ok else 0,
-                'subtitle_size_kb': round(subtitle_file.stat().st_size / 1024, 2) if subtitle_ok else 0
+                'audio_size_mb': round(audio_size / (1 << 20), 2) if audio_ok else 0,
+                'subtitle_size_kb': round(subtitle_size / 1024, 2) if subtitle_ok else 0
             }
             
             if audio_ok:  # Sucesso se pelo menos áudio foi baixado
@@ -284,6 +620,14 @@ class DownloadManager:
             self.error_log.append(error_entry)
             return False
     
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        """Tamanho do arquivo em bytes (0 se não existir)"""
+        try:
+            return os.stat(path).st_size
+        except FileNotFoundError:
+            return 0
+    
     def _organize_downloaded_files(self, video_ids: List[str]) -> None:
         """
         Organiza e valida arquivos baixados
@@ -297,50 +641,54 @@ class DownloadManager:
         for video_id in video_ids:
             video_dir = self.config.get_video_output_path(video_id)
             
-            if not video_dir.exists():
+            # Remove arquivos temporários comuns do yt-dlp (uma leitura do diretório)
+            try:
+                with os.scandir(video_dir) as iterator:
+                    entries = list(iterator)
+            except FileNotFoundError:
                 continue
             
-            # Remove arquivos temporários comuns do yt-dlp
-            temp_patterns = ["*.part", "*.ytdl", "*.tmp"]
-            for pattern in temp_patterns:
-                for temp_file in video_dir.glob(pattern):
-                    try:
-                        temp_file.unlink()
-                        print(f"🧹 Removido arquivo temporário: {temp_file.name}")
-                    except Exception as e:
-                        print(f"⚠️ Erro ao remover {temp_file}: {e}")
+            temp_files = [entry for entry in entries
+                          if entry.name.endswith(_TEMP_FILE_SUFFIXES) and entry.is_file()]
+            
+            for temp_file in temp_files:
+                try:
+                    os.unlink(temp_file.path)
+                    print(f"🧹 Removido arquivo temporário: {temp_file.name}")
+                except Exception as e:
+                    print(f"⚠️ Erro ao remover {temp_file.path}: {e}")
             
-            # Renomeia arquivos de legenda se necessário
-            self._standardize_subtitle_file(video_id)
+            # Renomeia arquivos de legenda se necessário (reaproveita a listagem)
+            self._standardize_subtitle_file(video_id, {entry.name for entry in entries})
     
-    def _standardize_subtitle_file(self, video_id: str) -> None:
+    def _standardize_subtitle_file(self, video_id: str, file_names: Optional[Set[str]] = None) -> None:
         """
         Padroniza nome do arquivo de legenda
         yt-dlp pode criar nomes como video_id.pt-BR.srt
         
         Args:
             video_id: ID do vídeo para padronizar
+            file_names: Nomes dos arquivos da pasta do vídeo (lista a pasta se None)
         """
         video_dir = self.config.get_video_output_path(video_id)
         target_subtitle = self.config.get_subtitle_file_path(video_id)
         
+        if file_names is None:
+            try:
+                file_names = set(os.listdir(video_dir))
+            except FileNotFoundError:
+                return
+        
         # Se já existe no formato correto, não faz nada
-        if target_subtitle.exists():
+        if target_subtitle.name in file_names:
             return
         
-        # Busca arquivos de legenda com padrões do yt-dlp
-        subtitle_patterns = [
-            f"{video_id}.pt-BR.srt",
-            f"{video_id}.pt.srt", 
-            f"{video_id}.pt-BR.vtt",
-            f"{video_id}.pt.vtt"
-        ]
-        
-        for pattern in subtitle_patterns:
-            source_file = video_dir / pattern
-            if source_file.exists():
+        # Busca arquivos de legenda com padrões do yt-dlp (em ordem de prioridade)
+        for suffix in _SUBTITLE_SUFFIXES:
+            pattern = video_id + suffix
+            if pattern in file_names:
                 try:
-                    source_file.rename(target_subtitle)
+                    os.replace(os.path.join(video_dir, pattern), target_subtitle)
                     print(f"📝 Legenda renomeada: {pattern} → {target_subtitle.name}")
                     break
                 except Exception as e:
@@ -355,10 +703,10 @@ class DownloadManager:
             video_ids: Lista de IDs para salvar
         """
         try:
+            payload = "".join(f"https://www.youtube.com/watch?v={video_id}\n" for video_id in video_ids)
+            
             with open(self.config.videos_list_file, 'w', encoding='utf-8') as f:
-                for video_id in video_ids:
-                    video_url = f"https://www.youtube.com/watch?v={video_id}"
-                    f.write(video_url + '\n')
+                f.write(payload)
             
             print(f"📝 Lista salva: {self.config.videos_list_file}")
             
@@ -420,8 +768,10 @@ class DownloadManager:
         try:
             report_file = self.config.output_dir / "execution_report.json"
             
+            # Serializa em memória e grava com uma única escrita
+            payload = json.dumps(report, indent=2, ensure_ascii=False, default=str)
             with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+                f.write(payload)
             
             print(f"📊 Relatório salvo: {report_file}")
             
@@ -432,23 +782,29 @@ class DownloadManager:
         """Imprime resumo final da execução"""
         stats = self.stats
         
-        print("\n" + "="*60)
-        print("RELATÓRIO FINAL DE DOWNLOAD")
-        print("="*60)
-        print(f"Tempo total: {stats['total_execution_time']:.1f} segundos")
-        print(f"Vídeos tentados: {stats['videos_attempted']}")
-        print(f"Sucessos: {stats['videos_successful']}")
-        print(f"Falhas: {stats['videos_failed']}")
-        print(f"Já existiam: {stats['videos_skipped']}")
-        print(f"Arquivos de áudio: {stats['audio_files_created']}")
-        print(f"Arquivos de legenda: {stats['subtitle_files_created']}")
+        lines = [
+            "\n" + "="*60,
+            "RELATÓRIO FINAL DE DOWNLOAD",
+            "="*60,
+            f"Tempo total: {stats['total_execution_time']:.1f} segundos",
+            f"Vídeos tentados: {stats['videos_attempted']}",
+            f"Sucessos: {stats['videos_successful']}",
+            f"Falhas: {stats['videos_failed']}",
+            f"Já existiam: {stats['videos_skipped']}",
+            f"Fora da duração: {stats['videos_filtered_duration']}",
+            f"Arquivos de áudio: {stats['audio_files_created']}",
+            f"Arquivos de legenda: {stats['subtitle_files_created']}",
+        ]
         
         # Taxa de sucesso
         if stats['videos_attempted'] > 0:
             success_rate = (stats['videos_successful'] / stats['videos_attempted']) * 100
-            print(f"Taxa de sucesso: {success_rate:.1f}%")
+            lines.append(f"Taxa de sucesso: {success_rate:.1f}%")
         
-        print("="*60)
+        lines.append("="*60)
+        
+        # Uma única escrita para o bloco inteiro
+        print("\n".join(lines))
         
         # Lista arquivos criados
         if stats['videos_successful'] > 0:
@@ -484,6 +840,7 @@ def quick_download(url: str, audio_quality: int = 256, limit: int = 5) -> Dict:
     config = create_config_instance(url)
     config.AUDIO_QUALITY = audio_quality
     config.DOWNLOAD_LIMIT = limit
+    config.invalidate_cache()
     
     # Executa download
     manager = DownloadManager(config)
@@ -508,12 +865,79 @@ def download_with_custom_config(config_dict: Dict) -> Dict:
     for key, value in config_dict.items():
         if hasattr(config, key.upper()):
             setattr(config, key.upper(), value)
+    config.invalidate_cache()
     
     # Executa download
     manager = DownloadManager(config)
     return manager.execute_download_pipeline()
 
 
+# Contagem por diretório para check_download_status (polling frequente):
+# caminho -> (mtime_ns, áudios, legendas, subdiretórios)
+_STATUS_DIR_CACHE: Dict[str, Tuple[int, int, int, Tuple[str, ...]]] = {}
+
+# Diretórios alterados há menos que isso não entram no cache (resolução do mtime)
+_STATUS_CACHE_MIN_AGE_NS = 2_000_000_000
+
+
+def _count_download_files(directory: str) -> Tuple[int, int]:
+    """
+    Conta arquivos de áudio e legenda em uma árvore de diretórios
+    Usa os.scandir diretamente: tipo da entrada vem da listagem, sem criar Path
+    Diretórios com mtime inalterado reaproveitam a contagem anterior
+    (criar, remover ou renomear arquivos altera o mtime do diretório)
+    
+    Args:
+        directory: Diretório raiz da contagem
+        
+    Returns:
+        Tuple[int, int]: (arquivos de áudio, arquivos de legenda)
+    """
+    audio_count = subtitle_count = 0
+    pending = [directory]
+    now_ns = time.time_ns()
+    
+    while pending:
+        path = pending.pop()
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            
+            cached = _STATUS_DIR_CACHE.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                audio_count += cached[1]
+                subtitle_count += cached[2]
+                pending.extend(cached[3])
+                continue
+            
+            with os.scandir(path) as iterator:
+                entries = list(iterator)
+        except FileNotFoundError:
+            _STATUS_DIR_CACHE.pop(path, None)
+            continue  # Removido durante a contagem
+        
+        dir_audio = dir_subtitle = 0
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith(('.mp3', '.wav')):
+                dir_audio += 1
+            elif entry.name.endswith('.srt'):
+                dir_subtitle += 1
+        
+        # Alterações muito recentes podem cair no mesmo tick de mtime: não guarda
+        if now_ns - mtime_ns > _STATUS_CACHE_MIN_AGE_NS:
+            _STATUS_DIR_CACHE[path] = (mtime_ns, dir_audio, dir_subtitle, tuple(subdirs))
+        else:
+            _STATUS_DIR_CACHE.pop(path, None)
+        
+        audio_count += dir_audio
+        subtitle_count += dir_subtitle
+        pending.extend(subdirs)
+    
+    return audio_count, subtitle_count
+
+
 def check_download_status(output_dir: str) -> Dict:
     """
     Verifica status de downloads em andamento
@@ -526,20 +950,16 @@ def check_download_status(output_dir: str) -> Dict:
         Dict: Status atual dos downloads
     """
     try:
-        base_path = Path(output_dir)
-        
-        if not base_path.exists():
+        if not os.path.isdir(output_dir):
             return {'status': 'not_started', 'progress': 0}
         
-        # Conta arquivos existentes
-        audio_files = list(base_path.glob("**/*.mp3")) + list(base_path.glob("**/*.wav"))
-        subtitle_files = list(base_path.glob("**/*.srt"))
+        audio_count, subtitle_count = _count_download_files(os.fspath(output_dir))
         
         return {
-            'status': 'completed' if audio_files else 'not_started',
-            'audio_count': len(audio_files),
-            'subtitle_count': len(subtitle_files),
-            'complete_pairs': min(len(audio_files), len(subtitle_files)),
+            'status': 'completed' if audio_count else 'not_started',
+            'audio_count': audio_count,
+            'subtitle_count': subtitle_count,
+            'complete_pairs': min(audio_count, subtitle_count),
             'last_update': datetime.now().isoformat()
         }
         
@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Busca de pastas de segments compartilhada entre normalizador e validador
+#
+
+import os
+
+
+def iter_segment_folders(base_dir, video_dirs=None):
+    """
+    Gera (pasta, arquivos) para busca dos diretórios de segments
+    Com video_dirs já listados, lê apenas as pastas segments/ em vez de varrer a árvore
+    """
+    if video_dirs is None:
+        for root, dirs, files in os.walk(base_dir):
+            yield root, files
+        return
+    
+    for video_dir in video_dirs:
+        segments_dir = os.path.join(video_dir, 'segments')
+        try:
+            yield segments_dir, os.listdir(segments_dir)
+        except FileNotFoundError:
+            continue
@@ -6,12 +6,15 @@ Implementacao baseada no projeto original com melhorias de modularizacao
 Integrado com configuracoes centralizadas do config master
 """
 
+import importlib.util
 import os
+import queue
+import threading
 import torch
 import torchaudio
 import time
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
 # Importa configuracoes centralizadas do config master
@@ -34,6 +37,7 @@ try:
     WINDOW_SIZE_SECONDS = default_config.SEGMENTATION['window_size_seconds']
     MIN_SILENCE_FOR_SPLIT = default_config.SEGMENTATION['min_silence_for_split']
     VOICE_THRESHOLD = default_config.SEGMENTATION['voice_threshold']
+    USE_ONNX = default_config.SEGMENTATION['use_onnx']
     
 except ImportError as e:
     print(f"Aviso: Nao foi possivel importar config master, usando valores padrao: {e}")
@@ -45,6 +49,7 @@ except ImportError as e:
     WINDOW_SIZE_SECONDS = 0.15
     MIN_SILENCE_FOR_SPLIT = 0.3
     VOICE_THRESHOLD = 0.5
+    USE_ONNX = False
 
 
 @dataclass
@@ -79,6 +84,7 @@ class AudioSegmenter:
         self.vad_model = None
         self.vad_utils = None
         self.vad_iterator = None
+        self.vad_onnx = False
         self.model_loaded = False
         self.load_time = 0
         
@@ -100,25 +106,19 @@ class AudioSegmenter:
             return True
             
         try:
-            print("Carregando modelo Silero VAD v4.0...")
             start_time = time.time()
             
-            # Carrega modelo exatamente como no projeto original
-            self.vad_model, self.vad_utils = torch.hub.load(
-                repo_or_dir='snakers4/silero-vad:v4.0', 
-                model='silero_vad', 
-                trust_repo=True
-            )
+            # ONNX Runtime e mais rapido na CPU; mesmos utilitarios do modelo TorchScript
+            use_onnx = USE_ONNX and importlib.util.find_spec('onnxruntime') is not None
+            print(f"Carregando modelo Silero VAD v4.0 ({'ONNX' if use_onnx else 'TorchScript'})...")
             
-            # Extrai utilitarios (mesmo padrao do original)
-            (self.get_speech_timestamps, 
-             self.save_audio, 
-             self.read_audio, 
-             self.VADIterator, 
-             self.collect_chunks) = self.vad_utils
-             
-            # Cria iterator para analise de janelas
-            self.vad_iterator = self.VADIterator(self.vad_model)
+            try:
+                self._set_vad_model(onnx=use_onnx)
+            except Exception as e:
+                if not use_onnx:
+                    raise
+                print(f"Aviso: VAD ONNX indisponivel, usando TorchScript: {e}")
+                self._set_vad_model(onnx=False)
             
             self.load_time = time.time() - start_time
             self.model_loaded = True
@@ -130,6 +130,90 @@ class AudioSegmenter:
             print(f"Erro ao carregar modelo VAD: {e}")
             return False
     
+    def _set_vad_model(self, onnx: bool) -> None:
+        """
+        Carrega o Silero VAD e extrai seus utilitarios
+        
+        Args:
+            onnx: True para versao ONNX Runtime, False para TorchScript
+        """
+        self.vad_model, self.vad_utils = self._load_silero_vad(onnx=onnx)
+        self.vad_onnx = onnx
+        
+        # Extrai utilitarios (mesmo padrao do original)
+        (self.get_speech_timestamps, 
+         self.save_audio, 
+         self.read_audio, 
+         self.VADIterator, 
+         self.collect_chunks) = self.vad_utils
+         
+        # Cria iterator para analise de janelas
+        self.vad_iterator = self.VADIterator(self.vad_model)
+    
+    def _detect_speech_segments(self, wav_data: torch.Tensor,
+                                config: SegmentationConfig) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Detecta fala e aplica regras de duracao (ambas as etapas executam o VAD)
+        Se a inferencia ONNX falhar (ex: versao do onnxruntime incompativel),
+        troca para TorchScript uma vez e repete as duas etapas
+        
+        Args:
+            wav_data: Dados de audio como tensor
+            config: Configuracoes de segmentacao
+            
+        Returns:
+            Tuple[List[Dict], List[Dict]]: (timestamps brutos do VAD, segmentos finais)
+        """
+        try:
+            return self._run_vad_segmentation(wav_data, config)
+        except Exception as e:
+            if not self.vad_onnx:
+                raise
+            print(f"Aviso: inferencia ONNX do VAD falhou, usando TorchScript: {e}")
+            self._set_vad_model(onnx=False)
+            return self._run_vad_segmentation(wav_data, config)
+    
+    def _run_vad_segmentation(self, wav_data: torch.Tensor,
+                              config: SegmentationConfig) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Timestamps de fala do VAD + divisao em pausas naturais (VAD iterator)
+        
+        Args:
+            wav_data: Dados de audio como tensor
+            config: Configuracoes de segmentacao
+            
+        Returns:
+            Tuple[List[Dict], List[Dict]]: (timestamps brutos do VAD, segmentos finais)
+        """
+        speech_timestamps = self.get_speech_timestamps(
+            wav_data, 
+            self.vad_model, 
+            sampling_rate=config.sampling_rate
+        )
+        
+        print(f"Detectados {len(speech_timestamps)} segmentos de fala brutos")
+        
+        # Processa segmentos aplicando regras de duracao
+        return speech_timestamps, self._process_speech_segments(wav_data, speech_timestamps, config)
+    
+    @staticmethod
+    def _load_silero_vad(onnx: bool) -> tuple:
+        """
+        Carrega Silero VAD v4.0 via torch.hub (mesmo repositorio do projeto original)
+        
+        Args:
+            onnx: True para versao ONNX Runtime, False para TorchScript
+            
+        Returns:
+            tuple: (modelo, utilitarios)
+        """
+        return torch.hub.load(
+            repo_or_dir='snakers4/silero-vad:v4.0', 
+            model='silero_vad', 
+            onnx=onnx,
+            trust_repo=True
+        )
+    
     def _already_segmented(self, audio_path: str) -> bool:
         """
         Verifica se audio ja foi segmentado
@@ -226,19 +310,8 @@ class AudioSegmenter:
             # Carrega audio na taxa do VAD
             wav_data = self.read_audio(audio_path, sampling_rate=config.sampling_rate)
             
-            # Detecta segmentos de fala
-            speech_timestamps = self.get_speech_timestamps(
-                wav_data, 
-                self.vad_model, 
-                sampling_rate=config.sampling_rate
-            )
-            
-            print(f"Detectados {len(speech_timestamps)} segmentos de fala brutos")
-            
-            # Processa segmentos aplicando regras de duracao
-            processed_segments = self._process_speech_segments(
-                wav_data, speech_timestamps, config
-            )
+            # Detecta segmentos de fala e aplica regras de duracao
+            speech_timestamps, processed_segments = self._detect_speech_segments(wav_data, config)
             
             print(f"Segmentos finais apos processamento: {len(processed_segments)}")
             
@@ -492,6 +565,74 @@ class AudioSegmenter:
         }
 
 
+class BackgroundSegmenter:
+    """
+    Segmenta audios em uma thread separada conforme chegam do download
+    Permite sobrepor a segmentacao com os downloads (e seus delays anti-bloqueio)
+    em vez de esperar o fim de todos os downloads
+    """
+    
+    def __init__(self, overwrite: bool = False):
+        """
+        Inicializa worker sem iniciar a thread
+        
+        Args:
+            overwrite: Se True, re-segmenta mesmo se ja existir
+        """
+        self.segmenter = AudioSegmenter()
+        self.overwrite = overwrite
+        self.results = []
+        # Sucessos sao excluidos da etapa de segmentacao; falhas sao tentadas de novo nela
+        self.succeeded_files = set()
+        self.failed_files = set()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="katube-segmenter", daemon=True)
+    
+    def start(self) -> "BackgroundSegmenter":
+        """Inicia thread de segmentacao"""
+        self._thread.start()
+        return self
+    
+    def submit(self, audio_path) -> None:
+        """
+        Enfileira audio para segmentacao
+        
+        Args:
+            audio_path: Caminho do arquivo de audio baixado
+        """
+        self._queue.put(str(audio_path))
+    
+    def close(self) -> List[Dict]:
+        """
+        Aguarda a fila esvaziar e encerra a thread
+        
+        Returns:
+            List[Dict]: Resultados individuais de cada audio segmentado
+        """
+        self._queue.put(None)
+        self._thread.join()
+        return self.results
+    
+    def _run(self) -> None:
+        """Loop da thread: segmenta audios ate receber sinal de parada"""
+        while True:
+            audio_path = self._queue.get()
+            if audio_path is None:
+                break
+            
+            try:
+                result = self.segmenter.segment_single_audio(audio_path, overwrite=self.overwrite)
+            except Exception as e:
+                # Um audio com erro nao pode derrubar a thread (fila ficaria sem consumidor)
+                result = {"success": False, "error": str(e)}
+            
+            self.results.append(result)
+            if result.get('success'):
+                self.succeeded_files.add(os.path.abspath(audio_path))
+            else:
+                self.failed_files.add(os.path.abspath(audio_path))
+
+
 # ========================================
 # FUNCOES DE CONVENIENCIA PARA USO EXTERNO
 # ========================================
@@ -521,7 +662,9 @@ def quick_segment(audio_path: str, min_duration: float = MIN_DURATION_SEC,
 
 
 def segment_from_downloads_folder(downloads_path: str = "downloads", 
-                                overwrite: bool = False) -> Dict:
+                                overwrite: bool = False,
+                                exclude: Optional[Iterable[str]] = None,
+                                video_dirs: Optional[List[str]] = None) -> Dict:
     """
     Segmenta todos os audios encontrados na pasta downloads
     Funciona com estrutura dinamica de IDs do YouTube
@@ -529,6 +672,8 @@ def segment_from_downloads_folder(downloads_path: str = "downloads",
     Args:
         downloads_path: Caminho da pasta downloads
         overwrite: Se True, re-segmenta arquivos ja processados
+        exclude: Caminhos ja segmentados nesta execucao (ex: BackgroundSegmenter)
+        video_dirs: Diretorios de video ja listados (evita busca recursiva)
         
     Returns:
         Dict: Relatorio do processamento em lote
@@ -541,9 +686,19 @@ def segment_from_downloads_folder(downloads_path: str = "downloads",
             "error": f"Pasta downloads nao encontrada: {downloads_path}"
         }
     
-    # Busca recursiva por todos os arquivos .mp3
-    audio_files = list(downloads_dir.rglob("*.mp3"))
-    audio_paths = [str(f) for f in audio_files]
+    if video_dirs is not None:
+        # Usa listagem pronta: audios ficam direto em downloads/tipo_id/video_id/
+        audio_paths = []
+        for video_dir in video_dirs:
+            try:
+                with os.scandir(video_dir) as entries:
+                    audio_paths.extend(e.path for e in entries if e.name.endswith(".mp3") and e.is_file())
+            except FileNotFoundError:
+                continue
+    else:
+        # Busca recursiva por todos os arquivos .mp3
+        audio_files = list(downloads_dir.rglob("*.mp3"))
+        audio_paths = [str(f) for f in audio_files]
     
     if not audio_paths:
         return {
@@ -551,6 +706,23 @@ def segment_from_downloads_folder(downloads_path: str = "downloads",
             "error": f"Nenhum arquivo .mp3 encontrado em {downloads_path}"
         }
     
+    # Remove audios ja segmentados em paralelo ao download
+    if exclude:
+        excluded = {os.path.abspath(p) for p in exclude}
+        audio_paths = [p for p in audio_paths if os.path.abspath(p) not in excluded]
+        
+        if not audio_paths:
+            return {
+                "batch_completed": True,
+                "total_files": 0,
+                "successful": 0,
+                "failed": 0,
+                "skipped": 0,
+                "total_segments_created": 0,
+                "individual_results": [],
+                "config_used": SegmentationConfig()
+            }
+    
     print(f"Encontrados {len(audio_paths)} arquivos de audio")
     
     segmenter = AudioSegmenter()
@@ -81,13 +81,14 @@ def check_pipeline_completed():
     
     # Verifica se o arquivo não está vazio
     try:
+        # Conta linhas iterando o arquivo (sem carregar tudo em memória)
         with open(final_dataset, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            line_count = sum(1 for _ in f)
         
-        if len(lines) <= 1:  # Só header
+        if line_count <= 1:  # Só header
             return False, "final_dataset.csv existe mas está vazio"
         
-        return True, f"Pipeline completo - {len(lines)-1} registros no dataset final"
+        return True, f"Pipeline completo - {line_count-1} registros no dataset final"
         
     except Exception as e:
         return False, f"Erro ao verificar final_dataset.csv: {e}"
@@ -209,8 +210,7 @@ def create_video_history_file(execution_reports, output_dir):
     if all_new_urls:
         try:
             with open(history_file, 'a', encoding='utf-8') as f:
-                for url in all_new_urls:
-                    f.write(url + '\n')
+                f.write('\n'.join(all_new_urls) + '\n')
             
             print(f"Histórico de vídeos atualizado: {history_file}")
             print(f"URLs adicionadas: {len(all_new_urls)}")
@@ -331,8 +331,8 @@ def create_processing_log(execution_reports, output_dir):
             final_dataset = os.path.join(output_dir, 'final_dataset.csv')
             if os.path.exists(final_dataset):
                 with open(final_dataset, 'r', encoding='utf-8') as df:
-                    lines = df.readlines()
-                    f.write(f"Total de segmentos aprovados: {len(lines)-1}\n")
+                    line_count = sum(1 for _ in df)
+                f.write(f"Total de segmentos aprovados: {line_count-1}\n")
             
             # Conta arquivos na pasta segments
             segments_dir = os.path.join(output_dir, 'segments')
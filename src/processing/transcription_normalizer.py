@@ -10,8 +10,15 @@ import json
 import re
 import unicodedata
 import os
+import sys
 from datetime import datetime
 
+# Diretório src no path (também ao executar este arquivo direto)
+src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+from processing._folders import iter_segment_folders
+
 def remove_html_tags(text):
     """
     Remove html tags from a string using regular expressions.
@@ -176,14 +183,15 @@ def process_segments_folder(segments_path):
         print(f"Erro ao salvar: {e}")
         return False
 
-def batch_process_all(base_dir):
+def batch_process_all(base_dir, video_dirs=None):
     """
     Processa todos os diretórios de segments
+    video_dirs: diretórios de vídeo já listados pela pipeline (opcional)
     """
     print("Procurando diretórios de segments...")
     
     processed = 0
-    for root, dirs, files in os.walk(base_dir):
+    for root, files in iter_segment_folders(base_dir, video_dirs):
         if 'transcricoes_lgris.json' in files and 'transcricoes_freds0.json' in files:
             if process_segments_folder(root):
                 processed += 1
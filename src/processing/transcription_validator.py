@@ -26,6 +26,7 @@ try:
     if src_path not in sys.path:
         sys.path.insert(0, src_path)
     
+    from processing._folders import iter_segment_folders
     from config import default_config
     
     # Threshold de similaridade vindo do config.py centralizado
@@ -320,9 +321,10 @@ def consolidate_datasets(all_approved_data, output_dir):
     except Exception as e:
         print(f"Erro ao salvar dataset final: {e}")
 
-def batch_validate_all(base_dir):
+def batch_validate_all(base_dir, video_dirs=None):
     """
     Valida todos os diretÃ³rios de segments e consolida resultados
+    video_dirs: diretorios de video ja listados pela pipeline (opcional)
     """
     print(f"Procurando arquivos normalized_transcriptions.json em: {base_dir}")
     print(f"Threshold configurado: {SIMILARITY_THRESHOLD}")
@@ -337,7 +339,7 @@ def batch_validate_all(base_dir):
     processed = 0
     all_approved_data = []  # Lista consolidada de todos os dados aprovados NOVOS
     
-    for root, dirs, files in os.walk(base_dir):
+    for root, files in iter_segment_folders(base_dir, video_dirs):
         if 'normalized_transcriptions.json' in files:
             approved_data = process_validation(root, output_segments_dir)
             if approved_data:
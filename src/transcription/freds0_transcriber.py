@@ -88,16 +88,18 @@ class Freds0Transcriber:
     Implementa processamento batch e interface padronizada
     """
     
-    def __init__(self, config: Optional[Freds0TranscriptionConfig] = None):
+    def __init__(self, config: Optional[Freds0TranscriptionConfig] = None,
+                 device_index: Optional[int] = None):
         """
         Inicializa transcritor com configuracao personalizada
         
         Args:
             config: Configuracao customizada (usa padrao se None)
+            device_index: GPU a utilizar (padrao: GPU 0 se disponivel)
         """
         self.config = config or Freds0TranscriptionConfig()
         self.pipe = None
-        self.device = self._detect_device()
+        self.device = self._detect_device(device_index)
         self.model_loaded = False
         self.load_time = 0
         
@@ -110,15 +112,19 @@ class Freds0Transcriber:
             'average_processing_time': 0
         }
     
-    def _detect_device(self) -> int:
+    def _detect_device(self, device_index: Optional[int] = None) -> int:
         """
         Detecta automaticamente o melhor dispositivo disponivel
         Retorna formato esperado pelo pipeline transformers
+        
+        Args:
+            device_index: GPU a utilizar (padrao: 0)
         """
         if torch.cuda.is_available():
-            device_name = torch.cuda.get_device_name(0)
-            print(f"GPU detectada para freds0: {device_name}")
-            return 0  # GPU
+            index = device_index or 0
+            device_name = torch.cuda.get_device_name(index)
+            print(f"GPU {index} detectada para freds0: {device_name}")
+            return index  # GPU
         else:
             print("Usando CPU para freds0 Whisper")
             return -1  # CPU
@@ -144,13 +150,13 @@ class Freds0Transcriber:
                 "automatic-speech-recognition",
                 model=self.config.model_name,
                 device=self.device,
-                torch_dtype=torch.float16 if self.device == 0 else torch.float32
+                torch_dtype=torch.float16 if self.device >= 0 else torch.float32
             )
             
             self.load_time = time.time() - start_time
             self.model_loaded = True
             
-            device_type = "GPU" if self.device == 0 else "CPU"
+            device_type = f"GPU {self.device}" if self.device >= 0 else "CPU"
             print(f"Modelo freds0 carregado em {self.load_time:.2f}s no {device_type}")
             return True
             
@@ -238,13 +244,15 @@ class Freds0Transcriber:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def find_all_segment_directories(self, downloads_base: str = "downloads") -> List[str]:
+    def find_all_segment_directories(self, downloads_base: str = "downloads",
+                                     video_dirs: Optional[List[str]] = None) -> List[str]:
         """
         Encontra todos os diretorios segments/ na estrutura downloads/
         Funciona com estrutura dinamica de IDs do YouTube
         
         Args:
             downloads_base: Diretorio base dos downloads
+            video_dirs: Diretorios de video ja listados (evita busca recursiva)
             
         Returns:
             List[str]: Lista de caminhos para diretorios segments/
@@ -255,9 +263,14 @@ class Freds0Transcriber:
             print(f"Diretorio downloads nao encontrado: {downloads_base}")
             return []
         
-        # Busca recursiva por pastas 'segments'
+        # Usa listagem pronta quando disponivel, senao busca recursiva por pastas 'segments'
+        if video_dirs is not None:
+            candidates = [Path(video_dir) / "segments" for video_dir in video_dirs]
+        else:
+            candidates = downloads_path.rglob("segments")
+        
         segment_dirs = []
-        for segments_dir in downloads_path.rglob("segments"):
+        for segments_dir in candidates:
             if segments_dir.is_dir():
                 # Verifica se tem arquivos .wav
                 wav_files = list(segments_dir.glob("*.wav"))
@@ -381,7 +394,8 @@ class Freds0Transcriber:
             }
     
     def transcribe_all_segments_batch(self, downloads_base: str = "downloads",
-                                    overwrite: bool = False) -> Dict:
+                                    overwrite: bool = False,
+                                    video_dirs: Optional[List[str]] = None) -> Dict:
         """
         Processa em lote todos os segmentos encontrados na estrutura downloads/
         Metodo principal para processamento completo
@@ -389,6 +403,7 @@ class Freds0Transcriber:
         Args:
             downloads_base: Diretorio base dos downloads
             overwrite: Sobrescrever transcricoes existentes
+            video_dirs: Diretorios de video ja listados (evita busca recursiva)
             
         Returns:
             Dict: Relatorio consolidado do processamento batch
@@ -400,7 +415,7 @@ class Freds0Transcriber:
         batch_start_time = time.time()
         
         # Encontra todos os diretorios segments
-        segment_directories = self.find_all_segment_directories(downloads_base)
+        segment_directories = self.find_all_segment_directories(downloads_base, video_dirs)
         
         if not segment_directories:
             return {
@@ -522,7 +537,9 @@ def quick_transcribe_freds0(segments_dir: str, overwrite: bool = False) -> Dict:
 
 
 def batch_transcribe_all_freds0(downloads_path: str = "downloads", 
-                               overwrite: bool = False) -> Dict:
+                               overwrite: bool = False,
+                               video_dirs: Optional[List[str]] = None,
+                               device_index: Optional[int] = None) -> Dict:
     """
     Processamento batch de todos os segmentos
     Interface simplificada para execucao completa
@@ -530,12 +547,14 @@ def batch_transcribe_all_freds0(downloads_path: str = "downloads",
     Args:
         downloads_path: Diretorio base downloads
         overwrite: Sobrescrever transcricoes existentes
+        video_dirs: Diretorios de video ja listados (evita busca recursiva)
+        device_index: GPU a utilizar (padrao: GPU 0 se disponivel)
         
     Returns:
         Dict: Relatorio consolidado
     """
-    transcriber = Freds0Transcriber()
-    return transcriber.transcribe_all_segments_batch(downloads_path, overwrite)
+    transcriber = Freds0Transcriber(device_index=device_index)
+    return transcriber.transcribe_all_segments_batch(downloads_path, overwrite, video_dirs)
 
 
 def check_freds0_transcription_status(downloads_path: str = "downloads") -> Dict:
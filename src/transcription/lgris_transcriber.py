@@ -89,17 +89,19 @@ class LgrisTranscriber:
     Implementa processamento batch e harmonizacao automatica de sample rate
     """
     
-    def __init__(self, config: Optional[LgrisTranscriptionConfig] = None):
+    def __init__(self, config: Optional[LgrisTranscriptionConfig] = None,
+                 device_index: Optional[int] = None):
         """
         Inicializa transcritor com configuracao personalizada
         
         Args:
             config: Configuracao customizada (usa padrao se None)
+            device_index: GPU a utilizar (padrao: GPU 0 se disponivel)
         """
         self.config = config or LgrisTranscriptionConfig()
         self.model = None
         self.processor = None
-        self.device = self._detect_device()
+        self.device = self._detect_device(device_index)
         self.model_loaded = False
         self.load_time = 0
         
@@ -112,15 +114,23 @@ class LgrisTranscriber:
             'average_processing_time': 0
         }
     
-    def _detect_device(self) -> str:
+    def _detect_device(self, device_index: Optional[int] = None) -> str:
         """
         Detecta automaticamente o melhor dispositivo disponivel
         Retorna string para compatibilidade com transformers
+        
+        Args:
+            device_index: GPU a utilizar (padrao: dispositivo cuda atual)
         """
         if torch.cuda.is_available():
-            device_name = torch.cuda.get_device_name(0)
-            print(f"GPU detectada para lgris: {device_name}")
-            return "cuda"
+            if device_index is None:
+                device_name = torch.cuda.get_device_name(0)
+                print(f"GPU detectada para lgris: {device_name}")
+                return "cuda"
+            
+            device_name = torch.cuda.get_device_name(device_index)
+            print(f"GPU {device_index} detectada para lgris: {device_name}")
+            return f"cuda:{device_index}"
         else:
             print("Usando CPU para lgris Wav2Vec2")
             return "cpu"
@@ -273,13 +283,15 @@ class LgrisTranscriber:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def find_all_segment_directories(self, downloads_base: str = "downloads") -> List[str]:
+    def find_all_segment_directories(self, downloads_base: str = "downloads",
+                                     video_dirs: Optional[List[str]] = None) -> List[str]:
         """
         Encontra todos os diretorios segments/ na estrutura downloads/
         Funciona com estrutura dinamica de IDs do YouTube
         
         Args:
             downloads_base: Diretorio base dos downloads
+            video_dirs: Diretorios de video ja listados (evita busca recursiva)
             
         Returns:
             List[str]: Lista de caminhos para diretorios segments/
@@ -290,9 +302,14 @@ class LgrisTranscriber:
             print(f"Diretorio downloads nao encontrado: {downloads_base}")
             return []
         
-        # Busca recursiva por pastas 'segments'
+        # Usa listagem pronta quando disponivel, senao busca recursiva por pastas 'segments'
+        if video_dirs is not None:
+            candidates = [Path(video_dir) / "segments" for video_dir in video_dirs]
+        else:
+            candidates = downloads_path.rglob("segments")
+        
         segment_dirs = []
-        for segments_dir in downloads_path.rglob("segments"):
+        for segments_dir in candidates:
             if segments_dir.is_dir():
                 # Verifica se tem arquivos .wav
                 wav_files = list(segments_dir.glob("*.wav"))
@@ -414,7 +431,8 @@ class LgrisTranscriber:
             }
     
     def transcribe_all_segments_batch(self, downloads_base: str = "downloads",
-                                    overwrite: bool = False) -> Dict:
+                                    overwrite: bool = False,
+                                    video_dirs: Optional[List[str]] = None) -> Dict:
         """
         Processa em lote todos os segmentos encontrados na estrutura downloads/
         Metodo principal para processamento completo
@@ -422,6 +440,7 @@ class LgrisTranscriber:
         Args:
             downloads_base: Diretorio base dos downloads
             overwrite: Sobrescrever transcricoes existentes
+            video_dirs: Diretorios de video ja listados (evita busca recursiva)
             
         Returns:
             Dict: Relatorio consolidado do processamento batch
@@ -433,7 +452,7 @@ class LgrisTranscriber:
         batch_start_time = time.time()
         
         # Encontra todos os diretorios segments
-        segment_directories = self.find_all_segment_directories(downloads_base)
+        segment_directories = self.find_all_segment_directories(downloads_base, video_dirs)
         
         if not segment_directories:
             return {
@@ -555,7 +574,9 @@ def quick_transcribe_lgris(segments_dir: str, overwrite: bool = False) -> Dict:
 
 
 def batch_transcribe_all_lgris(downloads_path: str = "downloads", 
-                              overwrite: bool = False) -> Dict:
+                              overwrite: bool = False,
+                              video_dirs: Optional[List[str]] = None,
+                              device_index: Optional[int] = None) -> Dict:
     """
     Processamento batch de todos os segmentos
     Interface simplificada para execucao completa
@@ -563,12 +584,14 @@ def batch_transcribe_all_lgris(downloads_path: str = "downloads",
     Args:
         downloads_path: Diretorio base downloads
         overwrite: Sobrescrever transcricoes existentes
+        video_dirs: Diretorios de video ja listados (evita busca recursiva)
+        device_index: GPU a utilizar (padrao: GPU 0 se disponivel)
         
     Returns:
         Dict: Relatorio consolidado
     """
-    transcriber = LgrisTranscriber()
-    return transcriber.transcribe_all_segments_batch(downloads_path, overwrite)
+    transcriber = LgrisTranscriber(device_index=device_index)
+    return transcriber.transcribe_all_segments_batch(downloads_path, overwrite, video_dirs)
 
 
 def check_lgris_transcription_status(downloads_path: str = "downloads") -> Dict:
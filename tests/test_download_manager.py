@@ -0,0 +1,62 @@
+"""
+Testes do espaçamento anti-bloqueio entre inícios de download
+Executar da raiz do projeto: python -m unittest discover tests
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from download.download_config import create_config_instance
+from download.download_manager import DownloadManager
+
+
+class DownloadPacingTest(unittest.TestCase):
+    """Inícios de download nunca ficam a menos de DELAY_MIN um do outro"""
+    
+    DELAY_MIN = 0.2
+    DELAY_MAX = 0.4
+    VIDEOS = 6
+    
+    def _start_times(self, max_workers: int) -> list:
+        config = create_config_instance()
+        config.DELAY_MIN_SECONDS = self.DELAY_MIN
+        config.DELAY_MAX_SECONDS = self.DELAY_MAX
+        config.MAX_WORKERS = max_workers
+        
+        manager = DownloadManager(config)
+        starts = []
+        lock = threading.Lock()
+        
+        def instant_download(video_id):
+            with lock:
+                starts.append(time.monotonic())
+            return True
+        
+        # Downloads instantâneos: só o limitador separa os inícios
+        manager._build_ydl_opts = lambda: None
+        manager._download_single_video = instant_download
+        manager._execute_downloads_with_delays([f"video{i:07d}" for i in range(self.VIDEOS)])
+        return sorted(starts)
+    
+    def _assert_min_gap(self, max_workers: int) -> None:
+        starts = self._start_times(max_workers)
+        self.assertEqual(len(starts), self.VIDEOS)
+        
+        smallest_gap = min(b - a for a, b in zip(starts, starts[1:]))
+        # Pequena tolerância para a resolução do relógio
+        self.assertGreaterEqual(smallest_gap, self.DELAY_MIN - 0.005)
+    
+    def test_min_gap_single_worker(self):
+        self._assert_min_gap(max_workers=1)
+    
+    def test_min_gap_parallel_workers(self):
+        self._assert_min_gap(max_workers=3)
+
+
+if __name__ == "__main__":
+    unittest.main()